@@ -1,14 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from routes import router
+from store import get_store
+from core.risk_engine import registry
+from core.reputation import reputation
+from core.blocklist import blocklist
+from core import metrics
+from logging_config import setup_logging
+from events import broadcaster
+import decision_token
 import logging
+import time
 
-# Configure logging so logger.info() calls in routes.py are visible
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(name)-12s | %(levelname)-5s | %(message)s",
-    datefmt="%H:%M:%S",
-)
+# JSON logs via a background queue listener (see logging_config.py)
+setup_logging(logging.INFO)
 
 app = FastAPI(
     title="SecureFlow API",
@@ -16,6 +22,59 @@ app = FastAPI(
     version="1.2.0",
 )
 
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware: per-route latency histogram, labelled by route
+    template. Event streams (/api/events) stay open for as long as the
+    client does, so they are timed only up to the response start.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500
+        stream_started = None
+
+        async def send_with_status(message):
+            nonlocal status, stream_started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if _is_event_stream(message.get("headers", ())):
+                    stream_started = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.REQUEST_SECONDS.observe(
+                (stream_started or time.perf_counter()) - start,
+                scope["method"], getattr(route, "path", "unmatched"), str(status),
+            )
+
+
+def _is_event_stream(headers) -> bool:
+    return any(
+        name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+        for name, value in headers
+    )
+
+
+metrics.gauge("secureflow_store_transactions", "Transactions held by the store", lambda: get_store().size())
+metrics.gauge("secureflow_rules_active", "Rules currently enabled", lambda: registry.total_rules)
+metrics.gauge("secureflow_reputation_entries", "Recipients in the reputation cache", lambda: len(reputation))
+metrics.gauge("secureflow_reputation_bytes", "Estimated memory held by the reputation cache", lambda: reputation.bytes)
+metrics.gauge("secureflow_reputation_flag_bytes", "Estimated memory held by cached UPI pattern flags", lambda: reputation.flag_bytes)
+metrics.gauge("secureflow_blocklist_ids", "UPI IDs in the mapped fraud blocklist", lambda: len(blocklist))
+metrics.gauge("secureflow_event_streams", "Open /api/events streams in this process", broadcaster.stream_count)
+
+app.add_middleware(MetricsMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,14 +82,26 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(router)
 
 @app.on_event("startup")
 def startup():
-    logging.getLogger("secureflow").info("SecureFlow engine ready — 9 rules · 4 friction tiers")
+    get_store()  # open + seed the store before the first request
+    logging.getLogger("secureflow").info(
+        "SecureFlow engine ready — %d rules · 4 friction tiers", registry.total_rules
+    )
+    if decision_token.EPHEMERAL_SECRET:
+        logging.getLogger("secureflow").warning(
+            "SECUREFLOW_DECISION_SECRET is not set — decision tokens are signed with a random startup key"
+        )
 
 @app.get("/")
-def root():
-    return {"message": "SecureFlow Backend Running"}
\ No newline at end of file
+async def root():
+    return {"message": "SecureFlow Backend Running"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
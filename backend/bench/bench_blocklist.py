@@ -0,0 +1,46 @@
+"""
+Microbenchmark: fraud blocklist lookups against the mapped fingerprint file.
+
+Builds blocklists of growing size from synthetic IDs in a temp directory,
+then times a listed and an unlisted lookup, and reports the file size
+(the memory all workers share through the page cache).
+
+Run from backend/:
+    python -m bench.bench_blocklist
+"""
+import os
+import tempfile
+import time
+import timeit
+
+from core.blocklist import Blocklist, build
+
+SIZES = [10_000, 1_000_000, 10_000_000]
+
+
+def _per_call_us(fn) -> float:
+    timer = timeit.Timer(fn)
+    number = max(1, int(0.2 / max(timer.timeit(10) / 10, 1e-9)))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main():
+    print(f"{'IDs':>11} | {'build s':>7} | {'file MB':>7} | {'listed µs':>9} | {'unlisted µs':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        source, table = os.path.join(tmp, "ids.txt"), os.path.join(tmp, "blocklist.bin")
+        for size in SIZES:
+            with open(source, "w", encoding="utf-8") as fh:
+                fh.writelines(f"reported{i:09d}@upi\n" for i in range(size))
+            start = time.perf_counter()
+            build(source, table)
+            built = time.perf_counter() - start
+
+            listed = Blocklist(table)
+            hit, miss = f"reported{size // 2:09d}@upi", "rahul@okaxis"
+            assert hit in listed and miss not in listed
+            print(f"{size:>11,} | {built:>7.1f} | {os.path.getsize(table) / 1e6:>7.1f} "
+                  f"| {_per_call_us(lambda: hit in listed):>9.2f} | {_per_call_us(lambda: miss in listed):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
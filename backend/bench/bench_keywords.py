@@ -0,0 +1,63 @@
+"""
+Microbenchmark: compiled Aho–Corasick matcher vs the per-keyword loop.
+
+Run from backend/:
+    python -m bench.bench_keywords
+"""
+import random
+import string
+import timeit
+
+from core.keyword_matcher import KeywordMatcher
+from core.risk_engine import SCAM_KEYWORDS
+
+SIZES = [50, 1_000, 10_000]
+REMARKS = [
+    "Tea money",
+    "Lunch split with the team, see you tomorrow",
+    "URGENT: verify your KYC immediately or account will be blocked",
+    "Claim your lottery prize now, pay processing fee to the bank manager",
+    "Rent share for March — flat 4B, includes electricity and maintenance",
+]
+
+
+def _loop_match(keywords, text):
+    lower = text.lower()
+    return [kw for kw in keywords if kw in lower]
+
+
+def _keyword_list(n: int, rng: random.Random):
+    """The real scam keywords padded with random words up to n entries."""
+    kws = list(SCAM_KEYWORDS[:n])
+    while len(kws) < n:
+        length = rng.randint(4, 12)
+        kws.append("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return kws
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'keywords':>9} | {'loop µs':>9} | {'automaton µs':>12} | {'speedup':>7}")
+    print("-" * 47)
+    for n in SIZES:
+        keywords = _keyword_list(n, rng)
+        matcher = KeywordMatcher(keywords)
+
+        for text in REMARKS:
+            assert matcher.find(text) == _loop_match(keywords, text), text
+
+        number = 200 if n <= 1_000 else 20
+        loop_t = timeit.timeit(
+            lambda: [_loop_match(keywords, t) for t in REMARKS], number=number
+        )
+        ac_t = timeit.timeit(
+            lambda: [matcher.find(t) for t in REMARKS], number=number
+        )
+        per_call = number * len(REMARKS)
+        loop_us = loop_t / per_call * 1e6
+        ac_us = ac_t / per_call * 1e6
+        print(f"{n:>9} | {loop_us:>9.2f} | {ac_us:>12.2f} | {loop_us / ac_us:>6.1f}×")
+
+
+if __name__ == "__main__":
+    main()
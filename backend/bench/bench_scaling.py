@@ -0,0 +1,123 @@
+"""
+Throughput scaling: requests/second against gunicorn with 1…N workers.
+
+For each worker count it starts `gunicorn app:app -c gunicorn.conf.py`
+on a fresh SQLite store, waits for /api/health, drives it with the
+load_test mix from several client processes at once, and stops it.
+Efficiency is RPS ÷ workers ÷ 1-worker RPS.
+
+The mix commits sends, and every worker's commits queue for SQLite's
+single writer; history pages vary, so reads miss the per-process
+response cache. Scoring scales with workers, the write path does not:
+expect efficiency to fall as workers grow, more so with a larger send
+share in load_test.MIX.
+
+The load generator competes with the server for CPUs here; for clean
+numbers run the server on its own machine and use bench.load_test.
+
+Run from backend/ (needs gunicorn, uvicorn-worker and httpx):
+    python -m bench.bench_scaling                    # 1, 2, 4 … up to the CPU count
+    python -m bench.bench_scaling --workers 1,2,4,8 --client-procs 8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench.load_test import run
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _default_workers() -> str:
+    counts, n = [], 1
+    while n < _cpus():
+        counts.append(n)
+        n *= 2
+    return ",".join(map(str, counts + [_cpus()]))
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/api/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def _client_proc(args) -> dict:
+    url, clients, duration, seed = args
+    return asyncio.run(run(url, clients, duration, seed=seed))
+
+
+def measure(workers: int, port: int, client_procs: int, clients: int, duration: float) -> dict:
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            PORT=str(port),
+            WEB_CONCURRENCY=str(workers),
+            SECUREFLOW_STORE=f"sqlite:{os.path.join(tmp, 'bench.db')}",
+            SECUREFLOW_LOG_SAMPLE="analyze=0,batch=0,send=0",
+        )
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "app:app", "-c", "gunicorn.conf.py"],
+            cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(url, proc)
+            with multiprocessing.Pool(client_procs) as pool:
+                reports = pool.map(_client_proc, [(url, clients, duration, 7 + i) for i in range(client_procs)])
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    return {
+        "rps": sum(r["rps"] for r in reports),
+        "errors": sum(r["errors"] for r in reports),
+        "p50Ms": max(r["p50Ms"] for r in reports),
+        "p99Ms": max(r["p99Ms"] for r in reports),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default=_default_workers(), help="comma-separated worker counts")
+    parser.add_argument("--client-procs", type=int, default=_cpus(), help="load generator processes")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent clients per process")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=5910)
+    args = parser.parse_args()
+
+    print(f"{_cpus()} CPUs · {args.client_procs}×{args.clients} clients · {args.duration:g}s per run")
+    print(f"{'workers':>7} | {'req/s':>9} | {'speedup':>7} | {'efficiency':>10} | {'p50 ms':>7} | {'p99 ms':>7} | {'errors':>6}")
+    base = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        row = measure(workers, args.port, args.client_procs, args.clients, args.duration)
+        base = base or row["rps"] / workers
+        speedup = row["rps"] / base
+        print(f"{workers:>7} | {row['rps']:>9.1f} | {speedup:>6.2f}× | {speedup / workers:>9.0%} "
+              f"| {row['p50Ms']:>7.2f} | {row['p99Ms']:>7.2f} | {row['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
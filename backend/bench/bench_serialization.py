@@ -0,0 +1,140 @@
+"""
+Microbenchmark: building and serializing a RiskResult response.
+
+"validated" is the previous path: every RiskReason and a fresh
+FrictionConfig validated on construction, a RiskResult model validated
+again against the response_model, then dumped to JSON by Pydantic.
+"trusted" is the current path: the reasons (validated once, by the
+engine) and the shared frozen friction tier copied into a plain dict,
+no second validation, orjson. Both carry a decision token, as
+/api/analyze responses do.
+
+For each scenario it reports time per response and the peak memory
+allocated while building one (tracemalloc), then times /api/analyze
+end to end through the ASGI app.
+
+Run from backend/ (HTTP part needs httpx):
+    python -m bench.bench_serialization
+"""
+import asyncio
+import os
+import statistics
+import time
+import timeit
+import tracemalloc
+
+from pydantic import TypeAdapter
+
+from core.friction_engine import map_friction
+from core.profile import UserProfile
+from core.risk_engine import score_transaction
+import decision_token
+from json_response import dumps, model_dict
+from models import AnalyzeRequest, FrictionConfig, RiskReason, RiskResult
+from store import to_epoch
+from bench.synthetic import generate_history
+
+PAYLOADS = {
+    "clean (0 reasons)": AnalyzeRequest(recipientUPI="rahul@okaxis", amount=500, remarks="Tea money"),
+    "risky (5 reasons)": AnalyzeRequest(recipientUPI="claim.prize@upi", amount=50000, remarks="urgent lottery"),
+}
+_response = TypeAdapter(RiskResult)
+
+# The four tiers as map_friction() used to build them, one new model per call
+_LEGACY_TIERS = (
+    ("LOW", "ALLOW", dict(type="NONE", delaySeconds=0, canOverride=True, color="green")),
+    ("LOW", "ALLOW", dict(type="TOAST", delaySeconds=0, canOverride=True, color="green")),
+    ("MEDIUM", "WARN", dict(type="DELAY", delaySeconds=5, canOverride=True, color="yellow")),
+    ("HIGH", "BLOCK", dict(type="BLOCK", delaySeconds=10, canOverride=False, color="red")),
+)
+
+
+def _validated(score: int, fields: list, token: str) -> bytes:
+    reasons = [RiskReason(**f) for f in fields]
+    tier = 0 if score <= 20 else 1 if score <= 45 else 2 if score <= 65 else 3
+    level, action, friction = _LEGACY_TIERS[tier]
+    result = RiskResult(
+        score=score, level=level, reasons=reasons, recommendedAction=action,
+        friction=FrictionConfig(**friction), analysisTimeMs=0.1, rulesEvaluated=9,
+        decisionToken=token,
+    )
+    # FastAPI: validate the return value against response_model, then serialize
+    return _response.dump_json(_response.validate_python(result))
+
+
+def _trusted(score: int, fields: list, token: str) -> bytes:
+    reasons = [RiskReason(**f) for f in fields]
+    level, action, friction = map_friction(score)
+    return dumps({
+        "score": score,
+        "level": level,
+        "reasons": [model_dict(r) for r in reasons],
+        "recommendedAction": action,
+        "friction": model_dict(friction),
+        "analysisTimeMs": 0.1,
+        "rulesEvaluated": 9,
+        "decisionToken": token,
+    })
+
+
+def _per_call_us(fn) -> float:
+    timer = timeit.Timer(fn)
+    number = max(1, int(0.2 / max(timer.timeit(10) / 10, 1e-9)))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def _peak_kib(fn) -> float:
+    fn()                                   # warm caches outside the measurement
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peak / 1024
+
+
+async def _http_analyze(requests: int = 500) -> float:
+    import httpx
+    import app as app_module
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    samples = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        payloads = [p.model_dump() for p in PAYLOADS.values()]
+        for i in range(requests + 20):
+            t0 = time.perf_counter()
+            resp = await client.post("/api/analyze", json=payloads[i % len(payloads)])
+            elapsed = time.perf_counter() - t0
+            resp.raise_for_status()
+            if i >= 20:
+                samples.append(elapsed * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    os.environ.setdefault("SECUREFLOW_LOG_SAMPLE", "analyze=0,batch=0,send=0")
+    profile = UserProfile()
+    for txn in generate_history(500):
+        profile.add(dict(txn, epoch=to_epoch(txn["timestamp"])))
+
+    print(f"{'response':<18} | {'validated µs':>12} | {'trusted µs':>10} | {'speedup':>7} "
+          f"| {'validated KiB':>13} | {'trusted KiB':>11}")
+    for name, payload in PAYLOADS.items():
+        score, reasons, _ = score_transaction(payload, profile, ["rahul@okaxis"])
+        fields = [r.model_dump(exclude={"contributionPercent"}) for r in reasons]
+        token = decision_token.issue("bench", payload, 0, "bench", "explain", score, fields, 9)
+        assert _validated(score, fields, token) == _trusted(score, fields, token)
+
+        old_us = _per_call_us(lambda: _validated(score, fields, token))
+        new_us = _per_call_us(lambda: _trusted(score, fields, token))
+        old_kib = _peak_kib(lambda: _validated(score, fields, token))
+        new_kib = _peak_kib(lambda: _trusted(score, fields, token))
+        print(f"{name:<18} | {old_us:>12.2f} | {new_us:>10.2f} | {old_us / new_us:>6.1f}× "
+              f"| {old_kib:>13.2f} | {new_kib:>11.2f}")
+
+    print(f"\nPOST /api/analyze end to end (in-process ASGI, p50): {asyncio.run(_http_analyze()):.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+HTTP load test: concurrent clients hammering a running SecureFlow server.
+
+Reports requests/second and p50 / p99 latency per endpoint, so the same
+run can be repeated against two builds (or two deployment modes) and
+compared. Needs httpx (`pip install httpx`).
+
+Each client works as its own user (created on start). Its sends go
+through the store's write path and invalidate its cached reads, and
+its history reads page through with varying filters, so the run is not
+served from the response cache alone.
+
+Run from backend/ against a server started separately:
+    python -m uvicorn app:app --port 5000
+    python -m bench.load_test --url http://localhost:5000 --clients 64 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+PAYLOADS = [
+    {"recipientUPI": "rahul@okaxis", "amount": 500, "remarks": "Tea money"},
+    {"recipientUPI": "newuser@upi", "amount": 15000, "remarks": "Urgent money"},
+    {"recipientUPI": "fraud.shark@upi", "amount": 50000, "remarks": "Send to lottery prize"},
+    {"recipientUPI": "random@upi", "amount": 1000, "remarks": "send OTP for KYC"},
+    {"recipientUPI": "priya@upi", "amount": 800, "remarks": "Lunch split"},
+]
+
+# (method, path, weight) — mostly scoring, a share of committed sends,
+# some dashboard/history reads
+MIX = [
+    ("POST", "/api/analyze", 5),
+    ("POST", "/api/send", 2),
+    ("GET", "/api/dashboard-stats", 1),
+    ("GET", "/api/history", 1),
+    ("GET", "/api/user", 1),
+]
+
+HISTORY_FILTERS = [{}, {"status": "completed"}, {"status": "blocked"}, {"level": "LOW"}, {"level": "HIGH"}]
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+async def _new_user(client) -> dict:
+    """Create a user no send can run out of balance for; returns its request headers."""
+    user_id = f"load-{uuid.uuid4().hex[:12]}"
+    resp = await client.post("/api/users", json={
+        "id": user_id, "name": "Load Test", "upiId": f"{user_id}@upi", "balance": 1e12,
+    })
+    resp.raise_for_status()
+    return {"X-User-Id": user_id}
+
+
+def _history_params(rng, cursor) -> dict:
+    """Next page half the time, otherwise a first page under a random filter."""
+    if cursor is not None and rng.random() < 0.5:
+        return {"limit": 50, "cursor": cursor}
+    return {"limit": rng.choice([20, 50, 100]), **rng.choice(HISTORY_FILTERS)}
+
+
+async def _client(client, headers, deadline, latencies, errors, rng):
+    paths = [m for m in MIX for _ in range(m[2])]
+    cursor = None
+    while time.perf_counter() < deadline:
+        method, path, _ = rng.choice(paths)
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                resp = await client.post(path, json=rng.choice(PAYLOADS), headers=headers)
+            elif path == "/api/history":
+                resp = await client.get(path, params=_history_params(rng, cursor), headers=headers)
+                cursor = resp.headers.get("X-Next-Cursor")
+            else:
+                resp = await client.get(path, headers=headers)
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if ok:
+            latencies.setdefault(path, []).append(elapsed_ms)
+        else:
+            errors[path] = errors.get(path, 0) + 1
+
+
+async def run(url: str, clients: int, duration: float, seed: int = 7) -> dict:
+    latencies, errors = {}, {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        # Warm-up so the first-request store seeding is not measured
+        await client.get("/api/health")
+        users = await asyncio.gather(*[_new_user(client) for _ in range(clients)])
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            _client(client, users[i], deadline, latencies, errors, random.Random(seed + i))
+            for i in range(clients)
+        ])
+        wall = time.perf_counter() - start
+
+    everything = [ms for samples in latencies.values() for ms in samples]
+    report = {
+        "url": url,
+        "clients": clients,
+        "durationSec": round(wall, 2),
+        "requests": len(everything),
+        "errors": sum(errors.values()),
+        "rps": round(len(everything) / wall, 1),
+        "p50Ms": round(statistics.median(everything), 2) if everything else 0.0,
+        "p99Ms": round(_percentile(everything, 99), 2),
+        "endpoints": {
+            path: {
+                "requests": len(samples),
+                "p50Ms": round(statistics.median(samples), 2),
+                "p99Ms": round(_percentile(samples, 99), 2),
+            }
+            for path, samples in sorted(latencies.items())
+        },
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.url, args.clients, args.duration))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['clients']} clients · {report['durationSec']}s · "
+          f"{report['requests']} requests · {report['errors']} errors")
+    print(f"overall   {report['rps']:>8} req/s   p50 {report['p50Ms']:>7} ms   p99 {report['p99Ms']:>7} ms")
+    for path, row in report["endpoints"].items():
+        print(f"  {path:<24} n={row['requests']:<7} p50 {row['p50Ms']:>7} ms   p99 {row['p99Ms']:>7} ms")
+
+
+if __name__ == "__main__":
+    main()
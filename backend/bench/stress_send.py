@@ -0,0 +1,146 @@
+"""
+Concurrency stress test for /api/send and the store's atomic debit.
+
+Fires parallel sends that together exceed the balance and checks the
+invariants afterwards:
+  * the balance never goes negative,
+  * balance == starting balance − sum of completed sends,
+  * every accepted send is recorded exactly once, rejected ones not at all,
+  * concurrent traffic for one user never changes another user's state.
+
+Covers the HTTP path (in-process ASGI), raw threads against each store
+backend, and several processes sharing one SQLite file.
+
+Run from backend/ (needs httpx):
+    python -m bench.stress_send
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+
+import httpx
+
+from store import InMemoryStore, SQLiteStore
+
+AMOUNT = 1000.0
+START_BALANCE = 84750.50
+
+
+def _check(store, user_id, start_balance, accepted, expected_txns):
+    balance = store.balance(user_id)
+    txns = store.history(user_id)
+    completed = [t for t in txns if t.get("status") == "completed"]
+    spent = round(sum(t["amount"] for t in completed), 2)
+
+    assert balance >= 0, f"negative balance {balance}"
+    assert round(start_balance - spent, 2) == round(balance, 2), (start_balance, spent, balance)
+    assert len(txns) == expected_txns, (len(txns), expected_txns)
+    assert len({t["id"] for t in txns}) == len(txns), "duplicate transaction ids"
+    assert accepted == len(completed), (accepted, len(completed))
+    return balance, len(txns)
+
+
+def _txn(i: int) -> dict:
+    return {
+        "recipientUPI": "rahul@okaxis",
+        "recipientName": "Rahul",
+        "amount": AMOUNT,
+        "remarks": f"stress {i}",
+        "timestamp": "2026-01-01T00:00:00Z",
+        "status": "completed",
+        "riskResult": {"score": 0, "level": "LOW", "reasons": [], "recommendedAction": "ALLOW"},
+    }
+
+
+# ───────────────────────────────────────────────────
+# 1. HTTP — concurrent /api/send through the app
+# ───────────────────────────────────────────────────
+async def stress_http(n: int = 200):
+    import app as app_module
+    from mock_data import MOCK_USER
+    from store import get_store
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        await client.post("/api/reset")
+        payload = {"recipientUPI": "rahul@okaxis", "amount": AMOUNT, "remarks": "stress"}
+        responses = await asyncio.gather(*[client.post("/api/send", json=payload) for _ in range(n)])
+
+    ok = [r for r in responses if r.status_code == 200]
+    rejected = [r for r in responses if r.status_code == 400]
+    assert len(ok) + len(rejected) == n, {r.status_code for r in responses}
+
+    accepted = sum(1 for r in ok if r.json()["status"] == "completed")
+    balance, count = _check(get_store(), MOCK_USER["id"], START_BALANCE, accepted, len(ok))
+    print(f"http      {n} sends → {accepted} completed, {len(rejected)} rejected, balance ₹{balance}")
+
+
+# ───────────────────────────────────────────────────
+# 2. Threads — commit() hammered directly
+# ───────────────────────────────────────────────────
+def stress_threads(store, label: str, threads: int = 16, per_thread: int = 20):
+    users = ["USR-A", "USR-B"]
+    for user in users:
+        store.set_balance(user, START_BALANCE)
+    accepted = {user: 0 for user in users}
+    lock = threading.Lock()
+
+    def worker(t: int):
+        user = users[t % len(users)]
+        for i in range(per_thread):
+            if store.commit(user, _txn(i), debit=AMOUNT) is not None:
+                with lock:
+                    accepted[user] += 1
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for th in pool:
+        th.start()
+    for th in pool:
+        th.join()
+
+    for user in users:
+        balance, _ = _check(store, user, START_BALANCE, accepted[user], accepted[user])
+        print(f"{label:<9} {user}: {accepted[user]} accepted, balance ₹{balance}")
+
+
+# ───────────────────────────────────────────────────
+# 3. Processes — several workers sharing one SQLite file
+# ───────────────────────────────────────────────────
+def _process_worker(path: str, per_process: int, results):
+    store = SQLiteStore(path)
+    accepted = sum(
+        store.commit("USR-P", _txn(i), debit=AMOUNT) is not None for i in range(per_process)
+    )
+    results.put(accepted)
+
+
+def stress_processes(path: str, processes: int = 4, per_process: int = 40):
+    SQLiteStore(path).set_balance("USR-P", START_BALANCE)
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_process_worker, args=(path, per_process, results))
+        for _ in range(processes)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    accepted = sum(results.get() for _ in procs)
+    balance, _ = _check(SQLiteStore(path), "USR-P", START_BALANCE, accepted, accepted)
+    print(f"processes {processes}×{per_process} commits → {accepted} accepted, balance ₹{balance}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(stress_http())
+        stress_threads(InMemoryStore(), "memory")
+        stress_threads(SQLiteStore(os.path.join(tmp, "threads.db")), "sqlite")
+        stress_processes(os.path.join(tmp, "procs.db"))
+    print("all invariants hold")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Engine + HTTP benchmark suite over synthetic histories of growing size.
+
+For each history size it measures (per call, best of several repeats):
+  * profile / dashboard ingestion cost per row,
+  * analyze_transaction in explain and fast mode, and analyze_batch per item,
+  * map_friction,
+  * calculate_dashboard_stats (full recompute) vs the incremental aggregates,
+  * /api/analyze, /api/dashboard-stats, /api/history and /api/user through
+    the ASGI app in-process (no network), against a store holding the history.
+
+Results are written as JSON (with commit + environment metadata) so runs
+can be compared across commits with --compare.
+
+Run from backend/ (HTTP part needs httpx):
+    python -m bench.suite                              # 10 … 1M rows
+    python -m bench.suite --sizes 10,1000 --out before.json
+    python -m bench.suite --sizes 10,1000 --compare before.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+from bench.synthetic import generate_history
+from core.friction_engine import map_friction
+from core.profile import UserProfile
+from core.risk_engine import analyze_batch, analyze_transaction
+from core.stats_engine import DashboardAggregates, calculate_dashboard_stats
+from models import AnalyzeRequest
+from store import InMemoryStore, to_epoch
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+BENCH_USER = "USR-BENCH"
+
+PAYLOADS = [
+    AnalyzeRequest(recipientUPI="rahul@okaxis", amount=500, remarks="Tea money"),
+    AnalyzeRequest(recipientUPI="newuser@upi", amount=15000, remarks="Urgent money"),
+    AnalyzeRequest(recipientUPI="claim.prize@upi", amount=50000, remarks="Send to lottery prize"),
+    AnalyzeRequest(recipientUPI="priya@ybl", amount=800, remarks="Lunch split"),
+]
+TRUSTED = ["rahul@okaxis", "priya@ybl"]
+
+
+def _per_call_us(fn, repeat: int = 5, min_time: float = 0.2) -> float:
+    """Best-of-`repeat` time per call in µs, each run lasting at least min_time."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time or number >= 1 << 20:
+            break
+        number *= 4
+    return round(min(timer.repeat(repeat=repeat, number=number)) / number * 1e6, 3)
+
+
+def bench_engines(history: list) -> dict:
+    n = len(history)
+    newest_first = history[::-1]
+    stamped = [dict(txn, epoch=to_epoch(txn["timestamp"])) for txn in history]
+
+    start = time.perf_counter()
+    profile = UserProfile()
+    for txn in stamped:
+        profile.add(txn)
+    profile_add_us = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    aggregates = DashboardAggregates()
+    for txn in history:
+        aggregates.add(txn)
+    dashboard_add_us = (time.perf_counter() - start) / n * 1e6
+
+    payloads = itertools.cycle(PAYLOADS)
+    batch = PAYLOADS * 25
+    slow = n >= 100_000
+    return {
+        "profileAddUs": round(profile_add_us, 3),
+        "dashboardAddUs": round(dashboard_add_us, 3),
+        "analyzeExplainUs": _per_call_us(lambda: analyze_transaction(next(payloads), profile, TRUSTED)),
+        "analyzeFastUs": _per_call_us(lambda: analyze_transaction(next(payloads), profile, TRUSTED, fast=True)),
+        "analyzeBatchPerItemUs": round(
+            _per_call_us(lambda: analyze_batch(batch, profile, TRUSTED)) / len(batch), 3
+        ),
+        "mapFrictionUs": _per_call_us(lambda: map_friction(n % 101)),
+        "statsRecomputeUs": _per_call_us(
+            lambda: calculate_dashboard_stats(newest_first),
+            repeat=1 if slow else 3, min_time=0.0 if slow else 0.2,
+        ),
+        "statsIncrementalUs": _per_call_us(aggregates.stats),
+    }
+
+
+async def _bench_http(history: list, requests: int) -> dict:
+    import httpx
+    import app as app_module
+    import store as store_module
+
+    # Point the app at a store holding exactly this history
+    bench_store = InMemoryStore()
+    bench_store.claim_seed()
+    bench_store.put_user({"id": BENCH_USER, "name": "Bench", "upiId": "bench@upi",
+                          "trustedContacts": TRUSTED})
+    bench_store.set_balance(BENCH_USER, 1e12)
+    start = time.perf_counter()
+    for txn in history:
+        bench_store.add(BENCH_USER, txn)
+    ingest_us = (time.perf_counter() - start) / len(history) * 1e6
+    previous, store_module._store = store_module._store, bench_store
+
+    endpoints = {
+        "httpAnalyze": ("POST", "/api/analyze"),
+        "httpDashboardStats": ("GET", "/api/dashboard-stats"),
+        "httpHistoryPage": ("GET", "/api/history?limit=100"),
+        "httpUser": ("GET", "/api/user"),
+    }
+    results = {"storeIngestUs": round(ingest_us, 3)}
+    try:
+        transport = httpx.ASGITransport(app=app_module.app)
+        headers = {"X-User-Id": BENCH_USER}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            for name, (method, path) in endpoints.items():
+                samples = []
+                for i in range(requests + 5):
+                    payload = PAYLOADS[i % len(PAYLOADS)].model_dump()
+                    t0 = time.perf_counter()
+                    if method == "POST":
+                        resp = await client.post(path, json=payload)
+                    else:
+                        resp = await client.get(path)
+                    elapsed = time.perf_counter() - t0
+                    resp.raise_for_status()
+                    if i >= 5:                       # first few are warm-up
+                        samples.append(elapsed * 1e6)
+                results[name + "P50Us"] = round(statistics.median(samples), 1)
+                results[name + "MeanUs"] = round(statistics.fmean(samples), 1)
+    finally:
+        store_module._store = previous
+    return results
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import numpy
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _print_table(results: dict, baseline: dict | None):
+    metrics = sorted({m for row in results.values() for m in row})
+    sizes = list(results)
+    print(f"{'metric':<26}" + "".join(f"{s:>14}" for s in sizes))
+    for metric in metrics:
+        cells = []
+        for size in sizes:
+            value = results[size].get(metric)
+            old = (baseline or {}).get(size, {}).get(metric)
+            if value is None:
+                cells.append(f"{'—':>14}")
+            elif old:
+                cells.append(f"{value:>8.1f} {value / old:>4.2f}×")
+            else:
+                cells.append(f"{value:>14.1f}")
+        print(f"{metric:<26}" + "".join(cells))
+    print("(µs per call" + ("; ratio vs --compare run" if baseline else "") + ")")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma-separated history sizes")
+    parser.add_argument("--http-requests", type=int, default=200,
+                        help="timed requests per endpoint and size (0 skips HTTP)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results JSON to show ratios against")
+    args = parser.parse_args()
+
+    # Keep per-request log lines out of the measurements
+    os.environ.setdefault("SECUREFLOW_LOG_SAMPLE", "analyze=0,batch=0,send=0")
+
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"· {size:,} rows", file=sys.stderr)
+        history = generate_history(size, seed=args.seed)
+        row = bench_engines(history)
+        if args.http_requests:
+            row.update(asyncio.run(_bench_http(history, args.http_requests)))
+        results[str(size)] = row
+
+    report = {"meta": dict(_meta(), seed=args.seed), "results": results}
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+    _print_table(results, baseline)
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
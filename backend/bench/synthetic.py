@@ -0,0 +1,160 @@
+"""
+Synthetic transaction history for benchmarks.
+
+Produces seed-data-shaped rows (recipientUPI, amount, remarks, timestamp,
+status, riskResult) with a realistic shape rather than uniform noise:
+  * recipients are reused with a heavy tail — a Pitman–Yor process, so a
+    few contacts get most payments and new payees keep appearing (~√n),
+  * amounts are log-normal around ₹600 with clean round-number spikes,
+  * timestamps follow a daytime-heavy IST curve over a span that grows
+    with the history (merchant-sized histories are denser),
+  * a small share of scammy remarks / UPI IDs with large payments, and a
+    riskResult from the cheap rules (new recipient, 3× mean, round
+    number, keywords, night, UPI pattern) using the engine's weights.
+
+The same seed always gives the same history. Run from backend/ to
+preview a few rows:
+    python -m bench.synthetic 5
+"""
+from datetime import datetime, timedelta, timezone
+import json
+import math
+import random
+import sys
+
+from core.friction_engine import friction_tier, map_friction
+from core.risk_engine import RULES
+
+BENIGN_REMARKS = [
+    "", "", "", "Tea money", "Lunch split", "Rent share", "Groceries", "Electricity bill",
+    "Movie tickets", "Cab fare", "Birthday gift", "Dinner", "Books", "Gym fees", "Snacks",
+]
+SCAM_REMARKS = [
+    "urgent send money now", "claim your lottery prize", "KYC verify immediately",
+    "processing fee for refund", "bitcoin investment guaranteed returns",
+]
+NAMES = [
+    "rahul", "priya", "amit", "sneha", "vikram", "anita", "karan", "divya", "rohan", "meera",
+    "arjun", "kavya", "nikhil", "pooja", "sanjay", "neha", "deepak", "isha", "manoj", "ritu",
+]
+HANDLES = ["okaxis", "ybl", "paytm", "upi", "oksbi", "okhdfcbank", "ibl"]
+SCAM_UPIS = ["claim.prize@upi", "helpdesk24@ybl", "lucky.winner@paytm", "9876543210123@upi", "kyc.support@oksbi"]
+
+# Share of payments per IST hour (0–23): quiet nights, busy daytime and evening
+HOUR_WEIGHTS = [1, 0.5, 0.3, 0.2, 0.2, 0.5, 2, 4, 6, 7, 7, 7, 8, 7, 6, 6, 6, 7, 8, 9, 9, 7, 4, 2]
+
+_WEIGHTS = {rule.id: rule.weight for rule in RULES}
+_TITLES = {rule.id: rule.title for rule in RULES}
+_SEVERITY = {rule.id: rule.severity for rule in RULES}
+
+
+def _tier_table():
+    """(level, action, friction dict) for each friction tier, built once."""
+    table = {}
+    for score in (0, 30, 50, 100):
+        level, action, friction = map_friction(score)
+        table[friction_tier(score)] = (level, action, friction.model_dump())
+    return table
+
+
+def _recipients(n: int, rng: random.Random, alpha: float = 5.0, discount: float = 0.5):
+    """Pitman–Yor draws: index i is new with probability (alpha + d·K) / (i + alpha)."""
+    picks = []
+    distinct = 0
+    for i in range(n):
+        if rng.random() < (alpha + discount * distinct) / (i + alpha):
+            picks.append(distinct)
+            distinct += 1
+        else:
+            picks.append(picks[rng.randrange(i)])   # proportional to past use
+    return picks
+
+
+def _upi(k: int) -> str:
+    """Stable UPI ID for recipient k; about 2% of recipients look scammy."""
+    if k % 50 == 7:
+        return SCAM_UPIS[k // 50 % len(SCAM_UPIS)]
+    return f"{NAMES[k % len(NAMES)]}{k // len(NAMES) or ''}@{HANDLES[k % len(HANDLES)]}"
+
+
+def _amount(rng: random.Random) -> float:
+    r = rng.random()
+    if r < 0.02:
+        return float(rng.choice([10000, 20000, 50000]))
+    amount = math.exp(rng.gauss(math.log(600), 1.1))
+    if r < 0.10:
+        return float(max(100, round(amount, -2)))
+    return float(max(10, round(amount)))
+
+
+def _timestamps(n: int, rng: random.Random, end: datetime):
+    """n sorted UTC datetimes ending at `end`, at ~8/day up to a 3-year span."""
+    span_days = max(1.0, min(n / 8, 3 * 365))
+    hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=n)
+    stamps = []
+    for ist_hour in hours:
+        day = int(rng.random() * span_days)
+        seconds = ((ist_hour - 5) % 24) * 3600 + rng.randrange(3600)   # IST → UTC
+        stamps.append(end - timedelta(days=day + 1) + timedelta(seconds=seconds))
+    stamps.sort()
+    return stamps
+
+
+def generate_history(n: int, seed: int = 7, end: datetime | None = None) -> list:
+    """n synthetic transactions for one user, oldest first."""
+    rng = random.Random(seed)
+    end = end or datetime.now(timezone.utc).replace(microsecond=0)
+    tiers = _tier_table()
+    seen = set()
+    total = 0.0
+    rows = []
+
+    for k, ts in zip(_recipients(n, rng), _timestamps(n, rng, end)):
+        upi = _upi(k)
+        amount = float(rng.choice([5000, 10000, 20000, 50000])) if upi in SCAM_UPIS else _amount(rng)
+        scammy = rng.random() < (0.5 if upi in SCAM_UPIS else 0.03)
+        remarks = rng.choice(SCAM_REMARKS if scammy else BENIGN_REMARKS)
+        ist_hour = (ts.hour + 5) % 24
+
+        fired = []
+        if upi not in seen:
+            fired.append("NEW_RECIPIENT")
+        if rows and amount > total / len(rows) * 3:
+            fired.append("UNUSUAL_AMOUNT")
+        if amount >= 10000 and amount % 10000 == 0:
+            fired.append("LARGE_ROUND_NUMBER")
+        if remarks in SCAM_REMARKS:
+            fired.append("SCAM_KEYWORD")
+        if ist_hour >= 23 or ist_hour < 5:
+            fired.append("NIGHT_OWL")
+        if upi in SCAM_UPIS:
+            fired.append("SUSPICIOUS_UPI")
+        seen.add(upi)
+        total += amount
+
+        score = min(100, sum(_WEIGHTS[r] for r in fired))
+        level, action, friction = tiers[friction_tier(score)]
+        rows.append({
+            "recipientUPI": upi,
+            "recipientName": upi.split("@")[0].replace(".", " ").title(),
+            "amount": amount,
+            "remarks": remarks,
+            "timestamp": ts.isoformat().replace("+00:00", "Z"),
+            "status": "blocked" if action == "BLOCK" else "completed",
+            "riskResult": {
+                "score": score,
+                "level": level,
+                "reasons": [
+                    {"ruleId": r, "title": _TITLES[r], "severity": _SEVERITY[r], "scoreAdded": _WEIGHTS[r]}
+                    for r in fired
+                ],
+                "recommendedAction": action,
+                "friction": friction,
+            },
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    for row in generate_history(int(sys.argv[1]) if len(sys.argv) > 1 else 5):
+        print(json.dumps(row, ensure_ascii=False))
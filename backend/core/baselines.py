@@ -0,0 +1,180 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import copy
+import math
+import time
+
+# ═══════════════════════════════════════════════════
+# SPENDING BASELINES — constant-memory, recency-aware
+#
+# Lifetime mean / median let years-old habits dominate. These track the
+# user's *recent* spending instead, with state that does not grow with
+# the length of the history.
+# ═══════════════════════════════════════════════════
+
+DAY = 86400
+
+# Exponential decay: a payment's weight halves every this many days
+EWMA_HALF_LIFE_DAYS = 30
+
+# Rolling window for the windowed mean / median
+WINDOW_DAYS = 90
+
+# Amount histogram resolution: bucket edges grow by this ratio (≤1% error)
+BUCKET_RATIO = 1.02
+
+
+class DecayedMean:
+    """
+    Time-decayed average: each amount's weight is 2^(-age / half-life).
+
+    Only a weighted sum, a total weight and the newest epoch are kept;
+    both sums are rescaled on every insert, so the ratio is the decayed
+    mean as of the newest payment (and of any later time — decay scales
+    numerator and denominator alike).
+    """
+
+    def __init__(self, half_life_days: float = EWMA_HALF_LIFE_DAYS):
+        self._rate = math.log(2) / (half_life_days * DAY)
+        self._sum = 0.0
+        self._weight = 0.0
+        self._latest: Optional[float] = None
+
+    def add(self, amount: float, epoch: float):
+        if self._latest is None or epoch >= self._latest:
+            if self._latest is not None:
+                decay = math.exp(-self._rate * (epoch - self._latest))
+                self._sum *= decay
+                self._weight *= decay
+            self._latest = epoch
+            weight = 1.0
+        else:
+            # Older than what we have already seen: enters pre-decayed
+            weight = math.exp(-self._rate * (self._latest - epoch))
+        self._sum += weight * amount
+        self._weight += weight
+
+    def copy(self) -> "DecayedMean":
+        return copy.copy(self)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._sum / self._weight if self._weight else None
+
+
+class RollingAmounts:
+    """
+    Count, sum and a log-bucketed amount histogram per UTC day, for the
+    last `days` days. Memory is bounded by days × buckets in use, however
+    long the history; the median is read from the merged histogram and
+    is within BUCKET_RATIO of the exact windowed median.
+    """
+
+    def __init__(self, days: int = WINDOW_DAYS, ratio: float = BUCKET_RATIO):
+        self.days = days
+        self._log_ratio = math.log(ratio)
+        self._per_day: Dict[int, Tuple[List[float], Counter]] = {}   # day → ([count, sum], buckets)
+        self._buckets: Counter = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self._oldest: Optional[int] = None
+        # Bumped by every change; tags the cached sorted histogram
+        self._version = 0
+        self._sorted: Tuple[int, List[Tuple[int, int]]] = (-1, [])
+
+    def copy(self) -> "RollingAmounts":
+        clone = copy.copy(self)
+        clone._per_day = {day: (list(totals), Counter(buckets))
+                          for day, (totals, buckets) in self._per_day.items()}
+        clone._buckets = Counter(self._buckets)
+        return clone
+
+    def _first_day(self, now: float) -> int:
+        return int(now // DAY) - self.days + 1
+
+    def _bucket(self, amount: float) -> int:
+        return math.floor(math.log(max(amount, 0.01)) / self._log_ratio)
+
+    def _expire(self, now: float):
+        first = self._first_day(now)
+        if self._oldest is None or self._oldest >= first:
+            return
+        for day in [d for d in self._per_day if d < first]:
+            (count, total), buckets = self._per_day.pop(day)
+            self.count -= int(count)
+            self.sum -= total
+            self._buckets.subtract(buckets)
+        self._buckets = +self._buckets            # drop zero counts
+        self._oldest = min(self._per_day, default=None)
+        self._version += 1
+
+    def add(self, amount: float, epoch: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self._expire(now)
+        day = int(epoch // DAY)
+        if day < self._first_day(now):
+            return                                # already outside the window
+        totals, buckets = self._per_day.setdefault(day, ([0, 0.0], Counter()))
+        bucket = self._bucket(amount)
+        totals[0] += 1
+        totals[1] += amount
+        buckets[bucket] += 1
+        self._buckets[bucket] += 1
+        self.count += 1
+        self.sum += amount
+        self._oldest = day if self._oldest is None else min(self._oldest, day)
+        self._version += 1
+
+    def _stale(self, now: float) -> Optional[Tuple[int, float, Counter]]:
+        """
+        Count, sum and buckets of the days that have left the window since
+        the last add, or None when there are none. Reads leave them in
+        place (add() drops them), so concurrent readers never modify state.
+        """
+        first = self._first_day(now)
+        if self._oldest is None or self._oldest >= first:
+            return None
+        count, total, buckets = 0, 0.0, Counter()
+        for day, ((day_count, day_sum), day_buckets) in list(self._per_day.items()):
+            if day < first:
+                count += int(day_count)
+                total += day_sum
+                buckets.update(day_buckets)
+        return count, total, buckets
+
+    def mean(self, now: Optional[float] = None) -> Optional[float]:
+        count, total = self.count, self.sum
+        stale = self._stale(time.time() if now is None else now)
+        if stale is not None:
+            count, total = count - stale[0], total - stale[1]
+        return total / count if count else None
+
+    def median(self, now: Optional[float] = None) -> Optional[float]:
+        stale = self._stale(time.time() if now is None else now)
+        if stale is None:
+            count, ranked = self.count, self._sorted_buckets()
+        else:
+            count = self.count - stale[0]
+            ranked = sorted((self._buckets - stale[2]).items())
+        if not count:
+            return None
+        lower = self._value_at(ranked, (count - 1) // 2)
+        upper = self._value_at(ranked, count // 2)
+        return (lower + upper) / 2
+
+    def _sorted_buckets(self) -> List[Tuple[int, int]]:
+        version, ranked = self._sorted
+        if version != self._version:
+            version = self._version               # read first: a racing add makes this entry stale
+            ranked = sorted(self._buckets.items())
+            self._sorted = (version, ranked)
+        return ranked
+
+    def _value_at(self, ranked: List[Tuple[int, int]], rank: int) -> float:
+        """Representative amount (geometric bucket midpoint) of the rank-th smallest value."""
+        seen = 0
+        for bucket, count in ranked:
+            seen += count
+            if seen > rank:
+                return math.exp((bucket + 0.5) * self._log_ratio)
+        return math.exp((ranked[-1][0] + 0.5) * self._log_ratio)
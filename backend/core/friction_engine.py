@@ -1,51 +1,33 @@
+from bisect import bisect_left
 from models import FrictionConfig
+from core.metrics import FRICTION_TIERS
 
-def map_friction(score: int):
+# Scores above this are blocked outright
+BLOCK_THRESHOLD = 65
+
+# Upper score bound of each tier below BLOCK (NONE, TOAST, DELAY)
+TIER_BOUNDS = (20, 45, BLOCK_THRESHOLD)
+
+# (level, action, friction) per tier, built once. FrictionConfig is frozen,
+# so every response can share these instances.
+TIERS = (
+    ("LOW", "ALLOW", FrictionConfig(type="NONE", delaySeconds=0, canOverride=True, color="green")),
+    ("LOW", "ALLOW", FrictionConfig(type="TOAST", delaySeconds=0, canOverride=True, color="green")),
+    ("MEDIUM", "WARN", FrictionConfig(type="DELAY", delaySeconds=5, canOverride=True, color="yellow")),
+    ("HIGH", "BLOCK", FrictionConfig(type="BLOCK", delaySeconds=10, canOverride=False, color="red")),
+)
+
+# Tier counters bound once, indexed like TIERS
+_tier_counters = tuple(FRICTION_TIERS.labels(friction.type) for _, _, friction in TIERS)
 
-    if score <= 20:
-        return (
-            "LOW",
-            "ALLOW",
-            FrictionConfig(
-                type="NONE",
-                delaySeconds=0,
-                canOverride=True,
-                color="green"
-            )
-        )
-
-    elif score <= 45:
-        return (
-            "LOW",
-            "ALLOW",
-            FrictionConfig(
-                type="TOAST",
-                delaySeconds=0,
-                canOverride=True,
-                color="green"
-            )
-        )
-
-    elif score <= 65:
-        return (
-            "MEDIUM",
-            "WARN",
-            FrictionConfig(
-                type="DELAY",
-                delaySeconds=5,
-                canOverride=True,
-                color="yellow"
-            )
-        )
-
-    else:
-        return (
-            "HIGH",
-            "BLOCK",
-            FrictionConfig(
-                type="BLOCK",
-                delaySeconds=10,
-                canOverride=False,
-                color="red"
-            )
-        )
\ No newline at end of file
+
+def friction_tier(score: int) -> int:
+    """Index of the tier map_friction() would pick (0 = NONE … 3 = BLOCK)."""
+    return bisect_left(TIER_BOUNDS, score)
+
+
+def map_friction(score: int):
+    """(level, action, FrictionConfig) for a risk score; the config is a shared frozen instance."""
+    tier = friction_tier(score)
+    _tier_counters[tier].inc()
+    return TIERS[tier]
@@ -0,0 +1,60 @@
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a fixed keyword list.
+
+    Finds every keyword occurring in a text with a single pass over the
+    text, independent of how many keywords are loaded. Matches are
+    substring matches on the lowercased text, exactly like `kw in lower`.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(keywords)
+
+        # Node 0 is the root. _goto[n] maps a character to the next node,
+        # _out[n] lists keyword indices that end at n (incl. via fail links).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, kw in enumerate(self.keywords):
+            node = 0
+            for ch in kw:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(idx)
+
+        # Breadth-first pass to wire failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """Return the keywords found in text, in keyword-list order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set(out[0])
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits.update(out[node])
+        return [self.keywords[i] for i in sorted(hits)]
@@ -0,0 +1,218 @@
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+import threading
+
+# ═══════════════════════════════════════════════════
+# METRICS — Prometheus text exposition, no client library
+#
+# Every thread writes to its own shard (a plain dict reached through
+# threading.local), so observe() / inc() never take a lock. A scrape
+# sums the shards; it may miss an increment that is in flight, which is
+# fine for monitoring.
+# ═══════════════════════════════════════════════════
+
+# Request latency buckets (seconds)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Single-rule evaluation buckets (seconds) — most rules finish in microseconds
+RULE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []   # list.append is atomic under the GIL
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            self._shards.append(shard)
+            return shard
+
+    def _labels(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{k}="{v}"' for k, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _Child:
+    """A metric bound to one label set; holds this thread's row directly."""
+
+    __slots__ = ("_metric", "_labels", "_local", "_buckets")
+
+    def __init__(self, metric: "_Metric", labels: Tuple[str, ...]):
+        self._metric = metric
+        self._labels = labels
+        self._local = threading.local()
+        self._buckets = getattr(metric, "buckets", ())
+
+    def _row(self) -> list:
+        try:
+            return self._local.row
+        except AttributeError:
+            row = self._local.row = self._metric._new_row(self._labels)
+            return row
+
+    def inc(self, amount: float = 1):
+        try:
+            row = self._local.row
+        except AttributeError:
+            row = self._row()
+        row[0] += amount
+
+    def observe(self, value: float):
+        try:
+            row = self._local.row
+        except AttributeError:
+            row = self._row()
+        row[bisect_left(self._buckets, value)] += 1
+        row[-1] += value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_row(self, labels: Tuple[str, ...]) -> list:
+        shard = self._shard()
+        return shard.setdefault(labels, [0])
+
+    def labels(self, *values: str) -> _Child:
+        """Pre-bound handle for a hot path: skips the label lookup on every inc()."""
+        return _Child(self, values)
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._new_row(labels)[0] += amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in list(self._shards):
+            for labels, row in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + row[0]
+        return totals
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{self._labels(labels)} {value:g}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_row(self, labels: Tuple[str, ...]) -> list:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # per-bucket counts (last slot = +Inf), then sum
+            row = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        return row
+
+    def labels(self, *values: str) -> _Child:
+        """Pre-bound handle for a hot path: skips the label lookup on every observe()."""
+        return _Child(self, values)
+
+    def observe(self, value: float, *labels: str):
+        row = self._new_row(labels)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self) -> List[str]:
+        merged: Dict[Tuple[str, ...], list] = {}
+        for shard in list(self._shards):
+            for labels, row in list(shard.items()):
+                acc = merged.setdefault(labels, [0] * len(row))
+                for i, v in enumerate(row):
+                    acc[i] += v
+
+        lines = super().render()
+        for labels, row in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = self._labels(labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {row[-1]:g}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Read at scrape time from a callback — nothing to update on the hot path."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        return super().render() + [f"{self.name} {self.fn():g}"]
+
+
+_metrics: List[_Metric] = []
+
+
+def _register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labelnames, buckets))
+
+
+def gauge(name: str, help: str, fn: Callable[[], float]) -> Gauge:
+    return _register(Gauge(name, help, fn))
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format (version 0.0.4)."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ───────────────────────────────────────────────────
+# Engine metrics — shared by the engines and the app
+# ───────────────────────────────────────────────────
+REQUEST_SECONDS = histogram(
+    "secureflow_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+RULE_SECONDS = histogram(
+    "secureflow_rule_duration_seconds", "Time spent evaluating one rule (incl. lazy features)",
+    ("rule",), buckets=RULE_BUCKETS,
+)
+RULE_HITS = counter("secureflow_rule_hits_total", "Times a rule fired", ("rule",))
+FRICTION_TIERS = counter("secureflow_friction_tier_total", "Friction decisions by tier", ("tier",))
+DECISION_TOKENS = counter(
+    "secureflow_decision_tokens_total", "Decision tokens presented to /api/send by outcome", ("outcome",)
+)
+REPUTATION_LOOKUPS = counter(
+    "secureflow_reputation_lookups_total", "Recipient reputation cache lookups", ("result",)
+)
+REPUTATION_EVICTIONS = counter(
+    "secureflow_reputation_evictions_total", "Recipient reputation entries dropped", ("reason",)
+)
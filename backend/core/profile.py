@@ -0,0 +1,107 @@
+from typing import List, Set
+import bisect
+import copy
+import time
+
+from core.baselines import DecayedMean, RollingAmounts
+from core.quantiles import StreamingQuantiles
+
+# Sliding windows supported by the velocity counter, in seconds
+VELOCITY_WINDOWS = {"1m": 60, "10m": 600, "1h": 3600}
+
+
+class VelocityCounter:
+    """
+    Sliding-window counter of transaction epochs.
+
+    Keeps the epochs inside the largest configured window (sorted), so
+    counting any window is a single bisect. Older epochs are dropped on
+    add; counting never modifies the list.
+    """
+
+    def __init__(self, horizon: int = max(VELOCITY_WINDOWS.values())):
+        self.horizon = horizon
+        self._epochs: List[float] = []
+
+    def add(self, epoch: float):
+        bisect.insort(self._epochs, epoch)
+        self._prune(time.time())
+
+    def count(self, window: int, now: float | None = None) -> int:
+        """Number of transactions with epoch >= now - window."""
+        now = time.time() if now is None else now
+        return len(self._epochs) - bisect.bisect_left(self._epochs, now - window)
+
+    def copy(self) -> "VelocityCounter":
+        clone = copy.copy(self)
+        clone._epochs = list(self._epochs)
+        return clone
+
+    def _prune(self, now: float):
+        cut = bisect.bisect_left(self._epochs, now - self.horizon)
+        if cut:
+            del self._epochs[:cut]
+
+
+class UserProfile:
+    """
+    Incrementally maintained behavioural features for one user.
+
+    Updated once per recorded transaction so the risk engine can read
+    recipients / mean / quantiles without rescanning the history.
+    """
+
+    def __init__(self):
+        self.known_recipients: Set[str] = set()
+        self.amount_sum: float = 0.0
+        self.count: int = 0
+        self.velocity = VelocityCounter()
+        # Exact median / p90 / p99 for small histories, bounded sketch for large ones
+        self.amounts = StreamingQuantiles()
+        # Recency-aware baselines: decayed mean and a rolling 90-day window
+        self.ewma = DecayedMean()
+        self.window = RollingAmounts()
+
+    def add(self, txn: dict):
+        """Fold a single transaction into the profile."""
+        amount = txn["amount"]
+        self.known_recipients.add(txn["recipientUPI"])
+        self.amount_sum += amount
+        self.count += 1
+        self.velocity.add(txn["epoch"])
+        self.amounts.add(amount)
+        self.ewma.add(amount, txn["epoch"])
+        self.window.add(amount, txn["epoch"])
+
+    def clear(self):
+        """Drop all accumulated state."""
+        self.__init__()
+
+    def copy(self) -> "UserProfile":
+        """Independent snapshot, for scoring outside the store's lock."""
+        clone = copy.copy(self)
+        clone.known_recipients = set(self.known_recipients)
+        clone.velocity = self.velocity.copy()
+        clone.amounts = self.amounts.copy()
+        clone.ewma = self.ewma.copy()
+        clone.window = self.window.copy()
+        return clone
+
+    def has_paid(self, upi: str) -> bool:
+        return upi in self.known_recipients
+
+    @property
+    def mean(self) -> float:
+        return self.amount_sum / self.count if self.count else 0.0
+
+    @property
+    def median(self) -> float:
+        return self.amounts.quantile(0.5)
+
+    @property
+    def p90(self) -> float:
+        return self.amounts.quantile(0.9)
+
+    @property
+    def p99(self) -> float:
+        return self.amounts.quantile(0.99)
@@ -0,0 +1,147 @@
+from typing import List, Tuple
+import bisect
+import copy
+import math
+import random
+
+# ═══════════════════════════════════════════════════
+# STREAMING QUANTILES
+#
+# Exact while a user's history is small (one sorted list, any quantile
+# read from it in O(1)), then a KLL sketch with bounded memory once it
+# grows past EXACT_LIMIT. Exact values use linear interpolation between
+# order statistics (numpy's default), so q=0.5 is the usual median.
+# ═══════════════════════════════════════════════════
+
+# Above this many values the sorted list is folded into the sketch
+EXACT_LIMIT = 5_000
+
+# KLL accuracy parameter: ~1.7/k rank error, ~3k floats of memory
+SKETCH_K = 200
+
+
+def _interpolate(ordered: List[float], q: float) -> float:
+    """Quantile q of a sorted list, interpolating between order statistics."""
+    rank = (len(ordered) - 1) * q
+    lo = math.floor(rank)
+    frac = rank - lo
+    if frac == 0:
+        return ordered[lo]
+    return (1 - frac) * ordered[lo] + frac * ordered[lo + 1]
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty). Level h holds items of
+    weight 2^h; a full level is sorted and every other item (random
+    offset) is promoted. Memory is O(k) regardless of how many values
+    are added; a query's rank error is about 1.7/k with high probability.
+    """
+
+    def __init__(self, k: int = SKETCH_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self._levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+        # (n when built, values, cumulative weights)
+        self._sorted: Tuple[int, List[float], List[int]] = (-1, [], [])
+
+    def copy(self) -> "KLLSketch":
+        clone = copy.copy(self)
+        clone._levels = [list(items) for items in self._levels]
+        clone._rng = random.Random()
+        clone._rng.setstate(self._rng.getstate())
+        return clone
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def add(self, value: float):
+        self._levels[0].append(value)
+        self.n += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                items.sort()
+                # An odd item out stays behind so total weight stays exact
+                keep = [items.pop()] if len(items) % 2 else []
+                self._levels[level + 1].extend(items[self._rng.randint(0, 1)::2])
+                self._levels[level] = keep
+            level += 1
+
+    def quantile(self, q: float) -> float:
+        n, values, cumulative = self._sorted
+        if n != self.n:
+            n = self.n
+            weighted = sorted(
+                (v, 1 << level) for level, items in enumerate(self._levels) for v in items
+            )
+            cumulative, total = [], 0
+            for _, w in weighted:
+                total += w
+                cumulative.append(total)
+            values = [v for v, _ in weighted]
+            self._sorted = (n, values, cumulative)
+        target = q * (n - 1) + 1               # 1-based rank, same convention as the exact path
+        i = bisect.bisect_left(cumulative, target)
+        return values[min(i, len(values) - 1)]
+
+    def size(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+
+class StreamingQuantiles:
+    """
+    Running quantiles of a stream of amounts. Exact up to `exact_limit`
+    values (kept sorted: O(log n) search plus a memmove per insert), KLL
+    sketch afterwards.
+    """
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT, k: int = SKETCH_K):
+        self.exact_limit = exact_limit
+        self.k = k
+        self.n = 0
+        self._sorted: List[float] | None = []
+        self._sketch: KLLSketch | None = None
+
+    def copy(self) -> "StreamingQuantiles":
+        clone = copy.copy(self)
+        if self._sorted is not None:
+            clone._sorted = list(self._sorted)
+        if self._sketch is not None:
+            clone._sketch = self._sketch.copy()
+        return clone
+
+    @property
+    def exact(self) -> bool:
+        return self._sketch is None
+
+    def add(self, value: float):
+        self.n += 1
+        if self._sketch is not None:
+            self._sketch.add(value)
+            return
+
+        bisect.insort(self._sorted, value)
+        if self.n > self.exact_limit:
+            # Hand every value to the sketch and free the list
+            self._sketch = KLLSketch(self.k)
+            for v in self._sorted:
+                self._sketch.add(v)
+            self._sorted = None
+
+    def quantile(self, q: float) -> float:
+        """Quantile q of the values so far (0.0 when empty)."""
+        if not self.n:
+            return 0.0
+        if self._sketch is not None:
+            return self._sketch.quantile(q)
+        return _interpolate(self._sorted, q)
@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional, Set, Tuple
+import os
+import threading
+import time
+
+from core.metrics import REPUTATION_EVICTIONS, REPUTATION_LOOKUPS
+
+# ═══════════════════════════════════════════════════
+# RECIPIENT REPUTATION — what all users' payments say about a UPI ID
+#
+# One in-process table keyed by recipient UPI ID: how many distinct users
+# paid it, how many of those payments were blocked and by how many users.
+# Recipient IDs are unbounded, so the table is an LRU with a byte budget
+# and a TTL per entry. Only new evidence — a payer's first payment, or
+# their first blocked one — extends the TTL, so one user repeating
+# themselves cannot keep an entry alive.
+#
+# The table is per process: under gunicorn each worker's copy is fed only
+# by the sends that worker served, so BAD_REPUTATION can fire on one
+# worker and not yet on another for the same recipient.
+#
+# The suspicious-pattern flags of every analysed ID are cached beside it
+# in a smaller LRU of their own: analysis-only traffic to new IDs evicts
+# other flags, never what committed payments recorded.
+# ═══════════════════════════════════════════════════
+
+# Memory budget for the whole table (estimated, see _Entry.size)
+REPUTATION_MAX_BYTES = int(float(os.environ.get("SECUREFLOW_REPUTATION_MB", "64")) * 1024 * 1024)
+
+# An entry not written to for this long is dropped on its next lookup
+REPUTATION_TTL_SECONDS = 7 * 24 * 3600
+
+# Share of the budget given to the pattern-flag cache (on top of the table's)
+FLAG_BUDGET_SHARE = 1 / 8
+
+# Distinct payers (and blocked payers) remembered per recipient; beyond
+# this it is just "many"
+MAX_TRACKED_PAYERS = 32
+
+# Per-object costs (CPython 3.11, 64-bit, measured with tracemalloc)
+# used for the byte budget; they err on the high side
+_ENTRY_BYTES = 700            # entry + two empty payer sets + key string + LRU node
+_PAYER_BYTES = 130            # set slot + user id string
+_FLAG_ENTRY_BYTES = 260       # key string + (matcher, flags) tuple + empty list + LRU node
+_FLAG_BYTES = 8               # list slot (flag names are shared)
+
+
+class _Entry:
+    __slots__ = ("payers", "blockers", "payments", "blocked", "expires", "size")
+
+    def __init__(self, upi: str, now: float, ttl: float):
+        self.payers: Set[str] = set()
+        self.blockers: Set[str] = set()     # payers with at least one blocked payment
+        self.payments = 0
+        self.blocked = 0
+        self.expires = now + ttl
+        self.size = _ENTRY_BYTES + len(upi)
+
+    def resize(self, upi: str) -> int:
+        old = self.size
+        self.size = _ENTRY_BYTES + len(upi) + _PAYER_BYTES * (len(self.payers) + len(self.blockers))
+        return self.size - old
+
+
+def _note(members: Set[str], user_id: str) -> bool:
+    """Remember `user_id` (up to MAX_TRACKED_PAYERS); whether it was not seen before."""
+    if user_id in members:
+        return False
+    if len(members) < MAX_TRACKED_PAYERS:
+        members.add(user_id)
+    return True
+
+
+def _flag_size(upi: str, flags: List[str]) -> int:
+    return _FLAG_ENTRY_BYTES + len(upi) + _FLAG_BYTES * len(flags)
+
+
+class Reputation:
+    """Read-only snapshot of one recipient's entry, as rules see it."""
+
+    __slots__ = ("payers", "blockers", "payments", "blocked")
+
+    def __init__(self, payers: int, blockers: int, payments: int, blocked: int):
+        self.payers = payers
+        self.blockers = blockers
+        self.payments = payments
+        self.blocked = blocked
+
+    @property
+    def block_ratio(self) -> float:
+        return self.blocked / self.payments if self.payments else 0.0
+
+
+class ReputationCache:
+    """
+    Thread-safe LRU + TTL table of recipient reputations under a byte
+    budget, plus an LRU of pattern flags under FLAG_BUDGET_SHARE of it.
+    """
+
+    def __init__(self, max_bytes: int = REPUTATION_MAX_BYTES, ttl: float = REPUTATION_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.flag_max_bytes = int(max_bytes * FLAG_BUDGET_SHARE)
+        self.flag_bytes = 0
+        self._flags: "OrderedDict[str, Tuple[object, List[str]]]" = OrderedDict()  # upi → (matcher, flags)
+        self._lock = threading.Lock()
+        self._hit = REPUTATION_LOOKUPS.labels("hit")
+        self._miss = REPUTATION_LOOKUPS.labels("miss")
+        self._lru = REPUTATION_EVICTIONS.labels("lru")
+        self._ttl = REPUTATION_EVICTIONS.labels("ttl")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── internals (caller holds the lock) ────────────
+    def _get(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._miss.inc()
+            return None
+        if entry.expires <= now:
+            self._drop(key)
+            self._ttl.inc()
+            self._miss.inc()
+            return None
+        self._entries.move_to_end(key)
+        self._hit.inc()
+        return entry
+
+    def _insert(self, key: str, now: float) -> _Entry:
+        entry = self._entries[key] = _Entry(key, now, self.ttl)
+        self.bytes += entry.size
+        return entry
+
+    def _drop(self, key: str):
+        self.bytes -= self._entries.pop(key).size
+
+    def _shrink(self):
+        while self.bytes > self.max_bytes and self._entries:
+            self.bytes -= self._entries.popitem(last=False)[1].size
+            self._lru.inc()
+
+    # ── public API ────────────────────────────────────
+    def get(self, upi: str) -> Optional[Reputation]:
+        """Reputation of `upi`, or None if nothing (unexpired) is known about it."""
+        key = upi.lower()
+        with self._lock:
+            entry = self._get(key, time.time())
+            if entry is None or not entry.payments:
+                return None
+            return Reputation(len(entry.payers), len(entry.blockers), entry.payments, entry.blocked)
+
+    def record(self, upi: str, user_id: str, blocked: bool):
+        """
+        Fold one committed payment into the recipient's reputation. The
+        TTL restarts only if the payer, or the payer's block, is new here.
+        """
+        key = upi.lower()
+        now = time.time()
+        with self._lock:
+            entry = self._get(key, now) or self._insert(key, now)
+            entry.payments += 1
+            entry.blocked += blocked
+            fresh = _note(entry.payers, user_id)
+            if blocked:
+                fresh = _note(entry.blockers, user_id) or fresh
+            if fresh:
+                entry.expires = now + self.ttl
+            self.bytes += entry.resize(key)
+            self._shrink()
+
+    def flags(self, upi: str, matcher, compute: Callable[[str, object], List[str]]) -> List[str]:
+        """
+        Suspicious-pattern flags for `upi`: compute(upi, matcher) runs at
+        most once per recipient and matcher (a reloaded matcher recomputes).
+        """
+        key = upi.lower()
+        with self._lock:
+            cached = self._flags.get(key)
+            if cached is not None and cached[0] is matcher:
+                self._flags.move_to_end(key)
+                return cached[1]
+        flags = compute(upi, matcher)              # outside the lock: regex work
+        with self._lock:
+            # Another thread may have stored this key meanwhile: replace it
+            old = self._flags.pop(key, None)
+            if old is not None:
+                self.flag_bytes -= _flag_size(key, old[1])
+            self._flags[key] = (matcher, flags)
+            self.flag_bytes += _flag_size(key, flags)
+            while self.flag_bytes > self.flag_max_bytes and self._flags:
+                evicted, (_, evicted_flags) = self._flags.popitem(last=False)
+                self.flag_bytes -= _flag_size(evicted, evicted_flags)
+        return flags
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self._flags.clear()
+            self.flag_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = REPUTATION_LOOKUPS.values()
+        evictions = REPUTATION_EVICTIONS.values()
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "maxBytes": self.max_bytes,
+            "hits": int(lookups.get(("hit",), 0)),
+            "misses": int(lookups.get(("miss",), 0)),
+            "evictions": int(evictions.get(("lru",), 0)),
+            "expirations": int(evictions.get(("ttl",), 0)),
+            "flagEntries": len(self._flags),
+            "flagBytes": self.flag_bytes,
+        }
+
+
+reputation = ReputationCache()
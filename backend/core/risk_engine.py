@@ -1,15 +1,17 @@
 from typing import List, Tuple
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+import os
 import re
+import time
+import numpy as np
 from models import RiskReason
-
-def _parse_ts(ts: str) -> datetime:
-    """Parse an ISO timestamp (with optional Z suffix) into a UTC-aware datetime."""
-    cleaned = ts.replace("Z", "+00:00") if ts.endswith("Z") else ts
-    dt = datetime.fromisoformat(cleaned)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
+from core.profile import UserProfile, VELOCITY_WINDOWS
+from core.keyword_matcher import KeywordMatcher
+from core.friction_engine import friction_tier
+from core.rules import Feature, Rule, RuleRegistry, FeatureView, BatchFeatureView
+from core.metrics import RULE_HITS, RULE_SECONDS
+from core.reputation import MAX_TRACKED_PAYERS, reputation
+from core.blocklist import blocklist
 
 SCAM_KEYWORDS = [
     # classic bait words
@@ -31,160 +33,501 @@ SCAM_KEYWORDS = [
     "commission", "registration fee", "processing fee",
 ]
 
-# Regex patterns for suspicious UPI IDs
-SUSPICIOUS_UPI_PATTERNS = [
-    r"(claim|prize|win|lucky|reward|free|offer)",        # lure words in UPI
-    r"(helpdesk|support|care|service)\d*@",              # fake support IDs
-    r"(urgent|hurry|asap|quick)",                        # pressure in UPI ID
-    r"\d{10,}@",                                         # random long numbers
-    r"(scam|fraud|hack|steal|phish)",                    # obvious red flags
-]
+# Regex patterns for suspicious UPI IDs, keyed by the name reported to analysts
+SUSPICIOUS_UPI_PATTERNS = {
+    "lure_words":     r"(claim|prize|win|lucky|reward|free|offer)",   # lure words in UPI
+    "fake_support":   r"(helpdesk|support|care|service)\d*@",         # fake support IDs
+    "pressure_words": r"(urgent|hurry|asap|quick)",                   # pressure in UPI ID
+    "long_number":    r"\d{10,}@",                                    # random long numbers
+    "red_flags":      r"(scam|fraud|hack|steal|phish)",               # obvious red flags
+}
+
+
+def _compile_upi_patterns(patterns: dict) -> Tuple[re.Pattern, re.Pattern, Tuple[str, ...]]:
+    """
+    Compile the patterns into (prefilter, attribution, names).
+
+    The prefilter is one alternation of named zero-width lookaheads: a
+    single finditer() pass yields every offset where some pattern matches.
+    Only at those offsets, the attribution regex (one optional lookahead
+    per pattern) reports every pattern that matches there, not just the
+    first alternative.
+    """
+    lookaheads = [f"(?=(?P<{name}>{p}))" for name, p in patterns.items()]
+    return (
+        re.compile("|".join(lookaheads)),
+        re.compile("".join(f"{la}?" for la in lookaheads)),
+        tuple(patterns),
+    )
+
+
+# HIGH_FREQUENCY: flag when this many payments fall inside the window
+HIGH_FREQUENCY_WINDOW = VELOCITY_WINDOWS["10m"]
+HIGH_FREQUENCY_THRESHOLD = 3
+
+# BAD_REPUTATION: flag recipients whose payments were blocked for at
+# least this many different users, in at least this share of all the
+# payments made to them. One payer alone can never flag a recipient.
+REPUTATION_MIN_BLOCKERS = 2
+REPUTATION_BLOCK_RATIO = 0.5
+
+# Top-level keys of the rule config file
+CONFIG_KEYS = ("rules", "scamKeywords", "suspiciousUpiPatterns")
 
-TOTAL_RULES = 9  # keep in sync with the count below
+# Defaults restored whenever the rule config drops an override
+_DEFAULT_SCAM_KEYWORDS = list(SCAM_KEYWORDS)
+_DEFAULT_UPI_PATTERNS = dict(SUSPICIOUS_UPI_PATTERNS)
+
+# Compiled once at import; rebuilt by reload_scam_keywords() / the rule config
+_keyword_matcher = KeywordMatcher(SCAM_KEYWORDS)
+_upi_matcher = _compile_upi_patterns(SUSPICIOUS_UPI_PATTERNS)
+
+
+def reload_scam_keywords(keywords: List[str]):
+    """Replace the scam keyword list and rebuild the compiled matcher."""
+    global _keyword_matcher
+    matcher = KeywordMatcher(keywords)
+    SCAM_KEYWORDS[:] = keywords
+    _keyword_matcher = matcher
 
 
 def _find_matched_keywords(text: str) -> List[str]:
     """Return all scam keywords found in the text for detailed reporting."""
-    lower = text.lower()
-    return [kw for kw in SCAM_KEYWORDS if kw in lower]
+    return _keyword_matcher.find(text)
+
+
+def _find_upi_flags(upi: str, matcher=None) -> List[str]:
+    """Return the names of the suspicious UPI patterns matched, in declaration order."""
+    prefilter, attribution, names = matcher or _upi_matcher
+    upi = upi.lower()
+    fired = set()
+    for m in prefilter.finditer(upi):
+        groups = attribution.match(upi, m.start()).groupdict()
+        fired.update(name for name, value in groups.items() if value is not None)
+    return [name for name in names if name in fired]
+
+
+def _cached_upi_flags(upi: str) -> List[str]:
+    """_find_upi_flags() through the recipient reputation cache."""
+    return reputation.flags(upi, _upi_matcher, _find_upi_flags)
+
+
+def _ist_hour(now: datetime) -> int:
+    return (now.hour + 5) % 24  # rough IST conversion from UTC
+
+
+# ───────────────────────────────────────────────────
+# Features — computed lazily, only when an active rule asks for them.
+# Shared features depend on the profile and clock alone. Costs order the
+# rules: payload-only checks first, history aggregates last.
+# ───────────────────────────────────────────────────
+FEATURES = {
+    "amount":     Feature(lambda f: f.payload.amount, cost=0),
+    "is_new":     Feature(lambda f: not f.profile.has_paid(f.payload.recipientUPI)),
+    "trusted":    Feature(lambda f: f.payload.recipientUPI in f.trusted),
+    "mean":       Feature(lambda f: f.profile.mean if f.profile.count else None, cost=8, shared=True),
+    "median":     Feature(lambda f: f.profile.median if f.profile.count else None, cost=8, shared=True),
+    "p90":        Feature(lambda f: f.profile.p90 if f.profile.count else None, cost=8, shared=True),
+    "p99":        Feature(lambda f: f.profile.p99 if f.profile.count else None, cost=8, shared=True),
+    "ewma_mean":  Feature(lambda f: f.profile.ewma.value, cost=2, shared=True),
+    "window_mean": Feature(lambda f: f.profile.window.mean(f.now.timestamp()), cost=2, shared=True),
+    "window_median": Feature(lambda f: f.profile.window.median(f.now.timestamp()), cost=4, shared=True),
+    "recent":     Feature(lambda f: f.profile.velocity.count(HIGH_FREQUENCY_WINDOW, f.now.timestamp()),
+                          cost=8, shared=True),
+    "ist_hour":   Feature(lambda f: _ist_hour(f.now), shared=True),
+    "keywords":   Feature(lambda f: _find_matched_keywords(f.payload.remarks), cost=5),
+    "upi_flags":  Feature(lambda f: _cached_upi_flags(f.payload.recipientUPI), cost=3),
+    "reputation": Feature(lambda f: reputation.get(f.payload.recipientUPI), cost=3),
+    "blocklisted": Feature(lambda f: f.payload.recipientUPI in blocklist, cost=2),
+}
+
+
+def _is_night(hour: int) -> bool:
+    return hour >= 23 or hour < 5
+
+
+# How each baseline feature is named in a reason's description
+_BASELINE_LABELS = {
+    "mean": "average",
+    "ewma_mean": "recent average",
+    "window_mean": "90-day average",
+    "median": "median spend",
+    "window_median": "90-day median spend",
+}
+
+
+def _unusual_amount_description(f) -> str:
+    label = _BASELINE_LABELS[f.baselines["UNUSUAL_AMOUNT"]]
+    return f"Amount (₹{f['amount']:,.0f}) exceeds 3× your {label} (₹{f.baseline('UNUSUAL_AMOUNT'):,.0f})."
+
+
+def _behavioral_shift_description(f) -> str:
+    label = _BASELINE_LABELS[f.baselines["BEHAVIORAL_SHIFT"]]
+    median = f.baseline("BEHAVIORAL_SHIFT")
+    return (
+        f"Amount is {f['amount'] / median:.1f}× your {label} (₹{median:,.0f}). "
+        "Significant deviation detected."
+    )
+
+
+def _bad_reputation(rep) -> bool:
+    return (rep is not None and rep.blockers >= REPUTATION_MIN_BLOCKERS
+            and rep.block_ratio >= REPUTATION_BLOCK_RATIO)
+
+
+def rule_fired(reasons: List[dict], rule_id: str) -> bool:
+    """Whether `rule_id` is among `reasons` (as stored in a transaction's riskResult)."""
+    return any(reason["ruleId"] == rule_id for reason in reasons)
+
+
+def reputation_verdict_changed(payload, reasons: List[dict]) -> bool:
+    """
+    Whether BAD_REPUTATION would now decide differently than it did for
+    `reasons` (a signed result about to be reused). Every user's payments
+    move reputation, so decision tokens cannot pin it; it is re-checked.
+    """
+    if "BAD_REPUTATION" not in registry.active.order:
+        return False
+    return rule_fired(reasons, "BAD_REPUTATION") != _bad_reputation(reputation.get(payload.recipientUPI))
+
+
+def _reputation_description(f) -> str:
+    rep = f["reputation"]
+    blockers = f"{rep.blockers}+" if rep.blockers >= MAX_TRACKED_PAYERS else str(rep.blockers)
+    return (
+        f"SecureFlow blocked {rep.blocked} of {rep.payments} recent payments to this UPI ID "
+        f"(for {blockers} different users)."
+    )
+
+
+def _keyword_description(f) -> str:
+    matched_kws = f["keywords"]
+    kw_preview = ", ".join(f'"{ k}"' for k in matched_kws[:3])
+    suffix = f" (+{len(matched_kws) - 3} more)" if len(matched_kws) > 3 else ""
+    return f"Remarks contain flagged terms: {kw_preview}{suffix}."
+
+
+# ───────────────────────────────────────────────────
+# Rules — declaration order is the order reasons are reported in.
+# `when_many` is the NumPy form used by analyze_batch(). Rules with
+# `baselines` read the one selected in the rule config (default lifetime).
+# ───────────────────────────────────────────────────
+RULES = [
+    Rule(
+        id="NEW_RECIPIENT",
+        title="New Recipient Detected",
+        severity="MEDIUM",
+        weight=20,
+        features=("is_new",),
+        when=lambda f: f["is_new"],
+        describe=lambda f: "You have never paid this UPI ID before.",
+    ),
+    Rule(
+        id="UNUSUAL_AMOUNT",
+        title="Unusual Transaction Amount",
+        severity="MEDIUM",
+        weight=15,
+        features=("amount", "mean"),
+        when=lambda f: (
+            f.baseline("UNUSUAL_AMOUNT") is not None and f["amount"] > f.baseline("UNUSUAL_AMOUNT") * 3
+        ),
+        when_many=lambda f: (
+            f["amount"] > f.baseline("UNUSUAL_AMOUNT") * 3 if f.baseline("UNUSUAL_AMOUNT") is not None else False
+        ),
+        describe=_unusual_amount_description,
+        baselines={"lifetime": "mean", "ewma": "ewma_mean", "window90d": "window_mean"},
+        baseline="lifetime",
+    ),
+    Rule(
+        id="HIGH_FREQUENCY",
+        title="High Transaction Frequency",
+        severity="MEDIUM",
+        weight=15,
+        features=("recent",),
+        when=lambda f: f["recent"] >= HIGH_FREQUENCY_THRESHOLD,
+        when_many=lambda f: f["recent"] >= HIGH_FREQUENCY_THRESHOLD,
+        describe=lambda f: (
+            f"{f['recent']} transactions in the last {HIGH_FREQUENCY_WINDOW // 60} minutes "
+            "— potential rapid-fire fraud."
+        ),
+    ),
+    Rule(
+        id="LARGE_ROUND_NUMBER",
+        title="Large Round Number",
+        severity="LOW",
+        weight=10,
+        features=("amount",),
+        when=lambda f: f["amount"] >= 10000 and f["amount"] % 10000 == 0,
+        when_many=lambda f: (f["amount"] >= 10000) & (np.fmod(f["amount"], 10000) == 0),
+        describe=lambda f: "Large clean round amounts (₹10K+) are a common pattern in scam payments.",
+    ),
+    Rule(
+        id="SCAM_KEYWORD",
+        title="Suspicious Keywords Detected",
+        severity="HIGH",
+        weight=25,
+        features=("keywords",),
+        when=lambda f: bool(f["keywords"]),
+        describe=_keyword_description,
+    ),
+    Rule(
+        id="BEHAVIORAL_SHIFT",
+        title="Behavioral Spending Shift",
+        severity="HIGH",
+        weight=20,
+        features=("amount", "median"),
+        when=lambda f: bool(f.baseline("BEHAVIORAL_SHIFT")) and f["amount"] > f.baseline("BEHAVIORAL_SHIFT") * 4,
+        when_many=lambda f: (
+            f["amount"] > f.baseline("BEHAVIORAL_SHIFT") * 4 if f.baseline("BEHAVIORAL_SHIFT") else False
+        ),
+        describe=_behavioral_shift_description,
+        baselines={"lifetime": "median", "window90d": "window_median"},
+        baseline="lifetime",
+    ),
+    Rule(
+        id="NIGHT_OWL",
+        title="Late-Night Transaction",
+        severity="LOW",
+        weight=10,
+        features=("ist_hour",),
+        when=lambda f: _is_night(f["ist_hour"]),
+        when_many=lambda f: _is_night(f["ist_hour"]),
+        describe=lambda f: (
+            "Payments between 11 PM – 5 AM carry higher fraud risk. "
+            f"Current IST hour: ~{f['ist_hour']}:00."
+        ),
+    ),
+    Rule(
+        id="SUSPICIOUS_UPI",
+        title="Suspicious UPI ID Pattern",
+        severity="HIGH",
+        weight=20,
+        features=("upi_flags",),
+        when=lambda f: bool(f["upi_flags"]),
+        describe=lambda f: (
+            "The recipient's UPI ID matches known fraudulent naming patterns: "
+            f"{', '.join(f['upi_flags'])}."
+        ),
+    ),
+    Rule(
+        id="BAD_REPUTATION",
+        title="Recipient With Bad Reputation",
+        severity="HIGH",
+        weight=20,
+        features=("reputation",),
+        when=lambda f: _bad_reputation(f["reputation"]),
+        describe=_reputation_description,
+    ),
+    # Weighted so a listed ID alone delays the payment, and blocks it
+    # together with any other signal (e.g. first payment to it)
+    Rule(
+        id="BLOCKLISTED_UPI",
+        title="Reported Fraud UPI ID",
+        severity="HIGH",
+        weight=50,
+        features=("blocklisted",),
+        when=lambda f: f["blocklisted"],
+        describe=lambda f: "This UPI ID is on the blocklist of IDs reported for fraud.",
+    ),
+    # Anti-rule: reduces the score by up to `weight`, never below 0
+    Rule(
+        id="TRUSTED_CONTACT",
+        title="Trusted Contact Bonus",
+        severity="LOW",
+        weight=15,
+        features=("trusted",),
+        when=lambda f: f["trusted"],
+        describe=lambda f: "Recipient is in your trusted contacts list — risk score reduced.",
+        kind="reduce",
+    ),
+]
+
+
+def _apply_config(config: dict):
+    """
+    Rebuild keyword / pattern matchers from the rule config (or the
+    defaults). Raises ValueError on unknown keys or wrongly typed values.
+    """
+    global _keyword_matcher, _upi_matcher
+    unknown = sorted(set(config) - set(CONFIG_KEYS))
+    if unknown:
+        raise ValueError(f"unknown rule config keys: {unknown} (allowed: {list(CONFIG_KEYS)})")
+
+    keywords = config.get("scamKeywords", _DEFAULT_SCAM_KEYWORDS)
+    # A bare string would otherwise become one keyword per character
+    if not isinstance(keywords, list) or not all(isinstance(k, str) and k.strip() for k in keywords):
+        raise ValueError("scamKeywords must be a list of non-empty strings")
+    patterns = config.get("suspiciousUpiPatterns", _DEFAULT_UPI_PATTERNS)
+    if not isinstance(patterns, dict) or not all(isinstance(p, str) and p for p in patterns.values()):
+        raise ValueError("suspiciousUpiPatterns must map pattern names to non-empty regex strings")
+    keywords, patterns = list(keywords), dict(patterns)
+
+    # Compile both before swapping either, so a bad pattern leaves everything as it was
+    keyword_matcher = KeywordMatcher(keywords)
+    upi_matcher = _compile_upi_patterns(patterns)
+
+    SCAM_KEYWORDS[:] = keywords
+    SUSPICIOUS_UPI_PATTERNS.clear()
+    SUSPICIOUS_UPI_PATTERNS.update(patterns)
+    _keyword_matcher, _upi_matcher = keyword_matcher, upi_matcher
+
+
+RULES_CONFIG_PATH = os.environ.get(
+    "SECUREFLOW_RULES_CONFIG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules.json"),
+)
+
+registry = RuleRegistry(FEATURES, RULES, config_path=RULES_CONFIG_PATH, on_config=_apply_config)
+
+
+# rule id → (latency histogram, hit counter), bound once per rule
+_rule_metrics: dict = {}
+
+
+def _timed_when(rule: Rule, f: FeatureView) -> bool:
+    """Evaluate one rule, recording its latency and hit count."""
+    handles = _rule_metrics.get(rule.id)
+    if handles is None:
+        handles = _rule_metrics[rule.id] = (RULE_SECONDS.labels(rule.id), RULE_HITS.labels(rule.id))
+    start = time.perf_counter()
+    hit = rule.when(f)
+    handles[0].observe(time.perf_counter() - start)
+    if hit:
+        handles[1].inc()
+    return hit
+
+
+def _reason(rule: Rule, f: FeatureView, score_added: int | None = None) -> RiskReason:
+    return RiskReason(
+        ruleId=rule.id,
+        title=rule.title,
+        description=rule.describe(f),
+        severity=rule.severity,
+        scoreAdded=rule.weight if score_added is None else score_added,
+    )
+
+
+def score_transaction(
+    payload, profile: UserProfile, trusted_contacts: List[str] | None = None, fast: bool = False,
+) -> Tuple[int, List[RiskReason], int]:
+    """
+    Score a transaction against the registry's active rules.
+    History-derived features are read from the user's incremental profile.
+
+    Additive rules run cheapest first. In fast mode evaluation stops as
+    soon as the friction tier is settled: the lowest possible final score
+    (nothing else fires) and the highest (everything left fires) fall in
+    the same tier, with the trusted-contact reduction applied to both.
+    The decision is then identical to a full run, but the score and
+    reasons only cover the rules that ran. The default "explain" mode
+    evaluates every rule, as the UI shows all reasons.
+    Returns (score 0-100, list[RiskReason], rules evaluated).
+    """
+    registry.maybe_reload()
+    blocklist.maybe_reload()
+    rules = registry.active
+
+    f = FeatureView(
+        registry.features, payload, profile, datetime.now(timezone.utc),
+        trusted=frozenset(trusted_contacts or ()), baselines=rules.baselines,
+    )
+    # Anti-rules are cheap membership checks; knowing them up front bounds the outcome
+    reducers = [r for r in rules.reducers if _timed_when(r, f)]
+    cut = sum(r.weight for r in reducers)
+
+    # Tier bounds lie strictly inside 0–100, so the tier of an unclamped
+    # score equals the tier of its clamped value
+    score = 0
+    remaining = sum(r.weight for r in rules.by_cost)
+    lowest_tier = friction_tier(-cut)
+    evaluated = len(rules.reducers)
+    fired: List[Rule] = []
+    for rule in rules.by_cost:
+        if fast and lowest_tier == friction_tier(score + remaining - cut):
+            break
+        evaluated += 1
+        remaining -= rule.weight
+        if _timed_when(rule, f):
+            score += rule.weight
+            fired.append(rule)
+            lowest_tier = friction_tier(score - cut)
+
+    fired.sort(key=lambda rule: rules.order[rule.id])
+    reasons = [_reason(rule, f) for rule in fired]
+
+    for rule in reducers:
+        reduction = min(score, rule.weight)
+        if reduction > 0:
+            score -= reduction
+            reasons.append(_reason(rule, f, -reduction))
+
+    score = max(0, min(100, score))
+
+    return score, reasons, evaluated
 
 
 def analyze_transaction(
-    payload, history: List[dict], trusted_contacts: List[str] | None = None
+    payload, profile: UserProfile, trusted_contacts: List[str] | None = None, fast: bool = False,
 ) -> Tuple[int, List[RiskReason]]:
+    """Score a transaction (see score_transaction). Returns (score 0-100, list[RiskReason])."""
+    score, reasons, _ = score_transaction(payload, profile, trusted_contacts, fast=fast)
+    return score, reasons
+
+
+def analyze_batch(
+    payloads: list, profile: UserProfile, trusted_contacts: List[str] | None = None
+) -> List[Tuple[int, List[RiskReason]]]:
     """
-    Score a transaction against 9 behavioural + contextual rules.
-    Returns (score 0-100, list[RiskReason]).
+    Score many transactions against the same profile in one go.
+
+    Shared features (mean, median, velocity, clock) are computed once, and
+    rules with a `when_many` form are evaluated as NumPy arrays. Results
+    are identical to calling analyze_transaction() for each payload.
     """
+    n = len(payloads)
+    if n == 0:
+        return []
 
-    score = 0
-    reasons: List[RiskReason] = []
-
-    # ── RULE 1 — NEW_RECIPIENT ──────────────────────────────────
-    is_new = not any(txn["recipientUPI"] == payload.recipientUPI for txn in history)
-    if is_new:
-        score += 20
-        reasons.append(RiskReason(
-            ruleId="NEW_RECIPIENT",
-            title="New Recipient Detected",
-            description="You have never paid this UPI ID before.",
-            severity="MEDIUM",
-            scoreAdded=20
-        ))
-
-    # ── RULE 2 — UNUSUAL_AMOUNT (3× average) ───────────────────
-    if history:
-        avg = sum(txn["amount"] for txn in history) / len(history)
-        if payload.amount > avg * 3:
-            score += 15
-            reasons.append(RiskReason(
-                ruleId="UNUSUAL_AMOUNT",
-                title="Unusual Transaction Amount",
-                description=f"Amount (₹{payload.amount:,.0f}) exceeds 3× your average (₹{avg:,.0f}).",
-                severity="MEDIUM",
-                scoreAdded=15
-            ))
-
-    # ── RULE 3 — HIGH_FREQUENCY (3+ in last 10 mins) ──────────
+    registry.maybe_reload()
+    blocklist.maybe_reload()
+    rules = registry.active
     now = datetime.now(timezone.utc)
-    recent = [
-        txn for txn in history
-        if now - _parse_ts(txn["timestamp"]) <= timedelta(minutes=10)
+    trusted = frozenset(trusted_contacts or ())
+    shared: dict = {}
+
+    amounts = np.fromiter((p.amount for p in payloads), dtype=np.float64, count=n)
+    batch = BatchFeatureView(registry.features, amounts, profile, now, shared, baselines=rules.baselines)
+    views = [
+        FeatureView(registry.features, p, profile, now, trusted=trusted, shared=shared,
+                    baselines=rules.baselines)
+        for p in payloads
     ]
-    if len(recent) >= 3:
-        score += 15
-        reasons.append(RiskReason(
-            ruleId="HIGH_FREQUENCY",
-            title="High Transaction Frequency",
-            description=f"{len(recent)} transactions in the last 10 minutes — potential rapid-fire fraud.",
-            severity="MEDIUM",
-            scoreAdded=15
-        ))
-
-    # ── RULE 4 — LARGE_ROUND_NUMBER ────────────────────────────
-    if payload.amount >= 10000 and payload.amount % 10000 == 0:
-        score += 10
-        reasons.append(RiskReason(
-            ruleId="LARGE_ROUND_NUMBER",
-            title="Large Round Number",
-            description="Large clean round amounts (₹10K+) are a common pattern in scam payments.",
-            severity="LOW",
-            scoreAdded=10
-        ))
-
-    # ── RULE 5 — SCAM_KEYWORD (with matched keyword details) ──
-    matched_kws = _find_matched_keywords(payload.remarks)
-    if matched_kws:
-        score += 25
-        kw_preview = ", ".join(f'"{ k}"' for k in matched_kws[:3])
-        suffix = f" (+{len(matched_kws) - 3} more)" if len(matched_kws) > 3 else ""
-        reasons.append(RiskReason(
-            ruleId="SCAM_KEYWORD",
-            title="Suspicious Keywords Detected",
-            description=f"Remarks contain flagged terms: {kw_preview}{suffix}.",
-            severity="HIGH",
-            scoreAdded=25
-        ))
-
-    # ── RULE 6 — BEHAVIORAL_SHIFT (Median-based) ──────────────
-    if history:
-        amounts = sorted(txn["amount"] for txn in history)
-        mid = len(amounts) // 2
-
-        if len(amounts) % 2 == 0:
-            median = (amounts[mid - 1] + amounts[mid]) / 2
+
+    def mask(rule: Rule) -> np.ndarray:
+        if rule.when_many is not None:
+            hits = np.broadcast_to(np.asarray(rule.when_many(batch), dtype=bool), (n,))
         else:
-            median = amounts[mid]
-
-        if median > 0 and payload.amount > median * 4:
-            score += 20
-            reasons.append(RiskReason(
-                ruleId="BEHAVIORAL_SHIFT",
-                title="Behavioral Spending Shift",
-                description=f"Amount is {payload.amount / median:.1f}× your median spend (₹{median:,.0f}). Significant deviation detected.",
-                severity="HIGH",
-                scoreAdded=20
-            ))
-
-    # ── RULE 7 — NIGHT_OWL (late-night transactions) ──────────
-    hour = now.hour  # UTC
-    ist_hour = (hour + 5) % 24  # rough IST conversion
-    if ist_hour >= 23 or ist_hour < 5:
-        score += 10
-        reasons.append(RiskReason(
-            ruleId="NIGHT_OWL",
-            title="Late-Night Transaction",
-            description=f"Payments between 11 PM – 5 AM carry higher fraud risk. Current IST hour: ~{ist_hour}:00.",
-            severity="LOW",
-            scoreAdded=10
-        ))
-
-    # ── RULE 8 — SUSPICIOUS_UPI (regex pattern check) ─────────
-    upi_lower = payload.recipientUPI.lower()
-    upi_flags = [p for p in SUSPICIOUS_UPI_PATTERNS if re.search(p, upi_lower)]
-    if upi_flags:
-        score += 20
-        reasons.append(RiskReason(
-            ruleId="SUSPICIOUS_UPI",
-            title="Suspicious UPI ID Pattern",
-            description="The recipient's UPI ID matches known fraudulent naming patterns.",
-            severity="HIGH",
-            scoreAdded=20
-        ))
-
-    # ── RULE 9 — TRUSTED_CONTACT (anti-rule: reduces score) ───
-    if trusted_contacts and payload.recipientUPI in trusted_contacts:
-        reduction = min(score, 15)  # reduce up to 15 pts, never below 0
-        if reduction > 0:
-            score -= reduction
-            reasons.append(RiskReason(
-                ruleId="TRUSTED_CONTACT",
-                title="Trusted Contact Bonus",
-                description="Recipient is in your trusted contacts list — risk score reduced.",
-                severity="LOW",
-                scoreAdded=-reduction
-            ))
+            hits = np.fromiter((bool(rule.when(f)) for f in views), dtype=bool, count=n)
+        # Batches count hits only; per-rule latency is sampled on the single path
+        RULE_HITS.inc(rule.id, amount=int(hits.sum()))
+        return hits
 
-    score = max(0, min(100, score))
+    additive = [(rule, mask(rule)) for rule in rules.additive]
+    scores = np.zeros(n, dtype=np.int64)
+    for rule, hits in additive:
+        scores += rule.weight * hits
+
+    reductions = []
+    for rule in rules.reducers:
+        cut = np.where(mask(rule), np.minimum(scores, rule.weight), 0)
+        scores -= cut
+        reductions.append((rule, cut))
+    final = np.clip(scores, 0, 100)
+
+    results = []
+    for i, f in enumerate(views):
+        reasons = [_reason(rule, f) for rule, hits in additive if hits[i]]
+        reasons += [_reason(rule, f, -int(cut[i])) for rule, cut in reductions if cut[i] > 0]
+        results.append((int(final[i]), reasons))
 
-    return score, reasons
\ No newline at end of file
+    return results
@@ -0,0 +1,245 @@
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("secureflow")
+
+SEVERITIES = ("LOW", "MEDIUM", "HIGH")
+
+# Fields a rule config may override per rule
+OVERRIDE_KEYS = ("weight", "severity", "enabled", "baseline")
+
+# ═══════════════════════════════════════════════════
+# RULE REGISTRY
+#
+# A rule declares the features it reads, its weight, severity and a
+# relative cost. Features are computed lazily and at most once per
+# evaluation, so a request only pays for what the active rules need.
+# Weights, severities, enabled flags and keyword / pattern lists can be
+# overridden from a JSON file that is re-read when it changes, as can
+# the baseline (lifetime / decayed / windowed) a rule compares against.
+# ═══════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class Feature:
+    fn: Callable            # fn(view) -> value; reads view.payload / profile / now / trusted
+    cost: int = 1
+    shared: bool = False    # depends only on profile + clock, so a batch computes it once
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    title: str
+    severity: str
+    weight: int
+    features: Tuple[str, ...]
+    when: Callable[["FeatureView"], bool]
+    describe: Callable[["FeatureView"], str]
+    # Optional NumPy form of `when` for batches: receives a BatchFeatureView
+    # whose per-payload numeric features are arrays, returns a bool array.
+    when_many: Optional[Callable] = None
+    # "add" rules raise the score; a "reduce" rule (anti-rule) lowers it by
+    # up to `weight` after all additive rules have run.
+    kind: str = "add"
+    enabled: bool = True
+    # Selectable baseline: name → feature, e.g. {"lifetime": "mean", "ewma": "ewma_mean"}.
+    # `baseline` is the selected name; the rule reads it via f.baseline(rule.id).
+    baselines: Optional[Dict[str, str]] = field(default=None, compare=False)
+    baseline: Optional[str] = None
+
+
+class FeatureView:
+    """Lazily computed, memoised features for one payload."""
+
+    def __init__(self, features: Dict[str, Feature], payload, profile, now,
+                 trusted: frozenset = frozenset(), shared: dict | None = None,
+                 baselines: Dict[str, str] | None = None):
+        self._features = features
+        self.baselines = baselines or {}
+        self.payload = payload
+        self.profile = profile
+        self.now = now
+        self.trusted = trusted
+        self._values: Dict[str, Any] = {}
+        self._shared = {} if shared is None else shared
+
+    def __getitem__(self, name: str):
+        feature = self._features[name]
+        cache = self._shared if feature.shared else self._values
+        if name not in cache:
+            cache[name] = feature.fn(self)
+        return cache[name]
+
+    def baseline(self, rule_id: str):
+        """Value of the baseline feature selected for `rule_id`."""
+        return self[self.baselines[rule_id]]
+
+
+class BatchFeatureView(FeatureView):
+    """Feature access for a whole batch: shared features once, 'amount' as an array."""
+
+    def __init__(self, features: Dict[str, Feature], amounts, profile, now, shared: dict,
+                 baselines: Dict[str, str] | None = None):
+        super().__init__(features, None, profile, now, shared=shared, baselines=baselines)
+        self.amounts = amounts
+
+    def __getitem__(self, name: str):
+        if name == "amount":
+            return self.amounts
+        if not self._features[name].shared:
+            raise KeyError(f"Feature '{name}' is per-payload and has no batch form")
+        return super().__getitem__(name)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """One consistent snapshot of the active rules, swapped as a whole on reload."""
+    rules: Tuple[Rule, ...]          # declaration order — the order reasons are reported in
+    additive: Tuple[Rule, ...]
+    reducers: Tuple[Rule, ...]
+    by_cost: Tuple[Rule, ...]        # evaluation order for additive rules
+    order: Dict[str, int]
+    baselines: Dict[str, str]        # rule id → selected baseline feature
+    digest: str = ""                 # fingerprint of the config it was built from
+
+
+class RuleRegistry:
+    """
+    Declared rules plus optional hot-reloaded overrides.
+
+    Callers read `registry.active` once per evaluation and use that
+    snapshot throughout. `on_config` receives the whole parsed config so
+    the engine can rebuild keyword / pattern matchers.
+    """
+
+    RELOAD_INTERVAL = 2.0  # seconds between config mtime checks
+
+    def __init__(self, features: Dict[str, Feature], rules: List[Rule],
+                 config_path: str | None = None, on_config: Callable[[dict], None] | None = None):
+        for rule in rules:
+            needed = list(rule.features) + list((rule.baselines or {}).values())
+            missing = [f for f in needed if f not in features]
+            if missing:
+                raise ValueError(f"Rule {rule.id} needs unknown features: {missing}")
+
+        self.features = features
+        self._defaults = list(rules)
+        self.config_path = config_path
+        self._on_config = on_config
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self._apply({})
+        self.maybe_reload(force=True)
+
+    def _apply(self, config: dict):
+        if not isinstance(config, dict):
+            raise ValueError("rule config must be a JSON object")
+        overrides = config.get("rules", {})
+        if not isinstance(overrides, dict):
+            raise ValueError("'rules' must be an object keyed by rule id")
+        # A misspelt id would otherwise be a silent no-op
+        unknown = sorted(set(overrides) - {rule.id for rule in self._defaults})
+        if unknown:
+            raise ValueError(f"unknown rule ids: {unknown}")
+
+        rules = []
+        for rule in self._defaults:
+            o = overrides.get(rule.id, {})
+            self._check_override(rule.id, o)
+            weight = o.get("weight", rule.weight)
+            if weight < 0:
+                raise ValueError(f"{rule.id}: weight must be >= 0 (use a reduce rule to lower scores)")
+            rules.append(replace(
+                rule,
+                weight=weight,
+                severity=o.get("severity", rule.severity),
+                enabled=o.get("enabled", rule.enabled),
+                **self._baseline_override(rule, o.get("baseline")),
+            ))
+        if self._on_config is not None:
+            self._on_config(config)
+
+        active = tuple(r for r in rules if r.enabled)
+        additive = tuple(r for r in active if r.kind == "add")
+        # Single assignment — concurrent readers see either the old or the new set
+        self.active = RuleSet(
+            rules=active,
+            additive=additive,
+            reducers=tuple(r for r in active if r.kind == "reduce"),
+            by_cost=tuple(sorted(additive, key=self.cost_of)),
+            order={r.id: i for i, r in enumerate(active)},
+            baselines={r.id: r.baselines[r.baseline] for r in active if r.baselines},
+            digest=hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16],
+        )
+
+    @staticmethod
+    def _check_override(rule_id: str, o) -> None:
+        """Reject overrides with unknown fields or values of the wrong type."""
+        if not isinstance(o, dict):
+            raise ValueError(f"{rule_id}: override must be an object")
+        unknown = sorted(set(o) - set(OVERRIDE_KEYS))
+        if unknown:
+            raise ValueError(f"{rule_id}: unknown override fields {unknown} (allowed: {list(OVERRIDE_KEYS)})")
+        if "weight" in o and (isinstance(o["weight"], bool) or not isinstance(o["weight"], int)):
+            raise ValueError(f"{rule_id}: weight must be an integer")
+        if "severity" in o and o["severity"] not in SEVERITIES:
+            raise ValueError(f"{rule_id}: severity must be one of {list(SEVERITIES)}")
+        if "enabled" in o and not isinstance(o["enabled"], bool):
+            raise ValueError(f"{rule_id}: enabled must be true or false")
+
+    @staticmethod
+    def _baseline_override(rule: Rule, name: str | None) -> dict:
+        """Fields to replace when a config selects another baseline for `rule`."""
+        if name is None or name == rule.baseline:
+            return {}
+        if not rule.baselines or name not in rule.baselines:
+            options = sorted(rule.baselines or ())
+            raise ValueError(f"{rule.id}: unknown baseline {name!r} (options: {options})")
+        old, new = rule.baselines[rule.baseline], rule.baselines[name]
+        return {
+            "baseline": name,
+            "features": tuple(new if f == old else f for f in rule.features),
+        }
+
+    @property
+    def total_rules(self) -> int:
+        return len(self.active.rules)
+
+    def cost_of(self, rule: Rule) -> int:
+        return sum(self.features[f].cost for f in rule.features)
+
+    def maybe_reload(self, force: bool = False):
+        """Re-read the config file if it changed (checked at most every RELOAD_INTERVAL)."""
+        if not self.config_path:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        self._next_check = now + self.RELOAD_INTERVAL
+
+        try:
+            mtime = os.stat(self.config_path).st_mtime
+        except FileNotFoundError:
+            if self._mtime is not None:
+                logger.info("Rule config %s removed — reverting to defaults", self.config_path)
+                self._mtime = None
+                self._apply({})
+            return
+
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.config_path, encoding="utf-8") as fh:
+                config = json.load(fh)
+            self._apply(config)
+            self._mtime = mtime
+            logger.info("Rule config loaded from %s (%d active rules)", self.config_path, self.total_rules)
+        except Exception as exc:
+            logger.warning("Invalid rule config %s: %s — keeping previous rules", self.config_path, exc)
+            self._mtime = mtime  # don't retry until the file changes again
@@ -1,6 +1,7 @@
 from typing import List
 from datetime import datetime, timedelta, timezone
-from collections import Counter
+from collections import Counter, deque
+from core.risk_engine import registry
 
 def _parse_ts(ts: str) -> datetime:
     """Parse an ISO timestamp (with optional Z suffix) into a UTC-aware datetime."""
@@ -11,130 +12,175 @@ def _parse_ts(ts: str) -> datetime:
     return dt
 
 
-def calculate_dashboard_stats(history: List[dict]):
-
-    total_transactions = len(history)
-    flagged_count = 0
-    blocked_count = 0
-    money_saved = 0
-    safe_count = 0
-    total_amount = 0
-    score_sum = 0
-
-    # Track top triggered rules across all transactions
-    rule_counter: Counter = Counter()
-    # Track hourly transaction distribution
-    hourly_dist = [0] * 24
+def _relative_time(ts: str, now: datetime) -> str:
+    """Human-friendly age of a timestamp ("42s ago", "3h ago", ...)."""
+    try:
+        dt = _parse_ts(ts)
+        diff = now - dt
+        if diff.total_seconds() < 60:
+            return f"{int(diff.total_seconds())}s ago"
+        elif diff.total_seconds() < 3600:
+            return f"{int(diff.total_seconds() // 60)}m ago"
+        elif diff.total_seconds() < 86400:
+            return f"{int(diff.total_seconds() // 3600)}h ago"
+        else:
+            return f"{int(diff.total_seconds() // 86400)}d ago"
+    except Exception:
+        return "—"
+
+
+class DashboardAggregates:
+    """
+    Materialized dashboard counters, updated once per recorded transaction.
+
+    Everything except the relative-time strings of recentTransactions is
+    maintained incrementally, so reading the stats is O(1) in history size.
+    """
+
+    RECENT_SIZE = 6
+    TREND_SIZE = 12
+
+    def __init__(self):
+        self.total_transactions = 0
+        self.flagged_count = 0
+        self.blocked_count = 0
+        self.money_saved = 0
+        self.safe_count = 0
+        self.medium_count = 0
+        self.high_count = 0
+        self.total_amount = 0
+        self.score_sum = 0
+        # Track top triggered rules across all transactions
+        self.rule_counter: Counter = Counter()
+        # (seq, position) of each rule's latest trigger, for stable tie-breaks
+        self._rule_last_seen: dict = {}
+        # Track hourly transaction distribution
+        self.hourly_dist = [0] * 24
+        # Newest transactions last
+        self._latest: deque = deque(maxlen=self.TREND_SIZE)
+
+    def add(self, txn: dict):
+        """Fold a single transaction into the counters."""
+        self.total_transactions += 1
+        self._latest.append(txn)
 
-    for txn in history:
         risk = txn.get("riskResult")
         if not risk:
-            continue
+            return
 
         level = risk.get("level")
         action = risk.get("recommendedAction")
         amount = txn.get("amount", 0)
-        score = risk.get("score", 0)
 
-        total_amount += amount
-        score_sum += score
+        self.total_amount += amount
+        self.score_sum += risk.get("score", 0)
 
         if level == "LOW":
-            safe_count += 1
+            self.safe_count += 1
+        elif level == "MEDIUM":
+            self.medium_count += 1
+        elif level == "HIGH":
+            self.high_count += 1
 
         if level in ["MEDIUM", "HIGH"]:
-            flagged_count += 1
+            self.flagged_count += 1
 
         if action == "BLOCK":
-            blocked_count += 1
-            money_saved += amount
+            self.blocked_count += 1
+            self.money_saved += amount
 
         # Count rule triggers
-        for reason in risk.get("reasons", []):
-            rule_counter[reason.get("ruleId", "UNKNOWN")] += 1
+        for pos, reason in enumerate(risk.get("reasons", [])):
+            rule_id = reason.get("ruleId", "UNKNOWN")
+            self.rule_counter[rule_id] += 1
+            if rule_id not in self._rule_last_seen or self._rule_last_seen[rule_id][0] != self.total_transactions:
+                self._rule_last_seen[rule_id] = (self.total_transactions, pos)
 
         # Hourly distribution
         try:
             dt = _parse_ts(txn.get("timestamp", ""))
-            hourly_dist[dt.hour] += 1
+            self.hourly_dist[dt.hour] += 1
         except Exception:
             pass
 
-    # Compute security score (inverse of average risk)
-    avg_risk = (score_sum / total_transactions) if total_transactions > 0 else 0
-    security_score = max(0, min(100, round(100 - avg_risk)))
+    def top_rules(self, n: int = 5) -> List[dict]:
+        # Ties go to the most recently triggered rule, as in a newest-first scan
+        ranked = sorted(
+            self.rule_counter.items(),
+            key=lambda item: (
+                -item[1],
+                -self._rule_last_seen[item[0]][0],
+                self._rule_last_seen[item[0]][1],
+            ),
+        )
+        return [{"ruleId": rid, "count": cnt} for rid, cnt in ranked[:n]]
+
+    def stats(self) -> dict:
+        """Render the dashboard payload from the current counters."""
+        total_transactions = self.total_transactions
+
+        # Compute security score (inverse of average risk)
+        avg_risk = (self.score_sum / total_transactions) if total_transactions > 0 else 0
+        security_score = max(0, min(100, round(100 - avg_risk)))
+
+        # Trust rate
+        trust_rate = round((self.safe_count / total_transactions * 100), 1) if total_transactions > 0 else 100.0
+
+        # Recent transactions (last 6, newest first) — only the relative time is computed here
+        now = datetime.now(timezone.utc)
+        recent = []
+        for txn in list(reversed(self._latest))[:self.RECENT_SIZE]:
+            risk = txn.get("riskResult", {})
+            recent.append({
+                "id": txn.get("id", ""),
+                "to": txn.get("recipientUPI", ""),
+                "name": txn.get("recipientName", "Unknown"),
+                "amount": txn.get("amount", 0),
+                "risk": risk.get("level", "LOW"),
+                "score": risk.get("score", 0),
+                "time": _relative_time(txn.get("timestamp", ""), now),
+            })
+
+        # Risk distribution
+        low_count = self.safe_count
+        med_count = self.medium_count
+        high_count = self.high_count
+        low_pct = round(low_count / total_transactions * 100) if total_transactions else 0
+        med_pct = round(med_count / total_transactions * 100) if total_transactions else 0
+        high_pct = 100 - low_pct - med_pct if total_transactions else 0
+
+        # Threat trend — scores over last N transactions (newest last)
+        threat_trend = [
+            txn.get("riskResult", {}).get("score", 0)
+            for txn in self._latest
+        ]
+
+        return {
+            "totalTransactions": total_transactions,
+            "flaggedCount": self.flagged_count,
+            "blockedCount": self.blocked_count,
+            "moneySaved": self.money_saved,
+            "safeCount": self.safe_count,
+            "securityScore": security_score,
+            "trustRate": trust_rate,
+            "avgRiskScore": round(avg_risk, 1),
+            "totalAmount": self.total_amount,
+            "recentTransactions": recent,
+            "riskDistribution": {
+                "low": {"count": low_count, "pct": low_pct},
+                "medium": {"count": med_count, "pct": med_pct},
+                "high": {"count": high_count, "pct": high_pct},
+            },
+            "topRules": self.top_rules(5),
+            "threatTrend": threat_trend,
+            "hourlyDistribution": list(self.hourly_dist),
+            "rulesEvaluated": registry.total_rules,
+        }
 
-    # Trust rate
-    trust_rate = round((safe_count / total_transactions * 100), 1) if total_transactions > 0 else 100.0
 
-    # Recent transactions (last 6, newest first — already newest-first from mock_data)
-    recent = []
-    for txn in history[:6]:
-        risk = txn.get("riskResult", {})
-        ts = txn.get("timestamp", "")
-        # Calculate relative time
-        try:
-            dt = _parse_ts(ts)
-            diff = datetime.now(timezone.utc) - dt
-            if diff.total_seconds() < 60:
-                time_str = f"{int(diff.total_seconds())}s ago"
-            elif diff.total_seconds() < 3600:
-                time_str = f"{int(diff.total_seconds() // 60)}m ago"
-            elif diff.total_seconds() < 86400:
-                time_str = f"{int(diff.total_seconds() // 3600)}h ago"
-            else:
-                time_str = f"{int(diff.total_seconds() // 86400)}d ago"
-        except Exception:
-            time_str = "—"
-
-        recent.append({
-            "id": txn.get("id", ""),
-            "to": txn.get("recipientUPI", ""),
-            "name": txn.get("recipientName", "Unknown"),
-            "amount": txn.get("amount", 0),
-            "risk": risk.get("level", "LOW"),
-            "score": risk.get("score", 0),
-            "time": time_str,
-        })
-
-    # Risk distribution
-    low_count = safe_count
-    med_count = sum(1 for t in history if t.get("riskResult", {}).get("level") == "MEDIUM")
-    high_count = sum(1 for t in history if t.get("riskResult", {}).get("level") == "HIGH")
-    low_pct = round(low_count / total_transactions * 100) if total_transactions else 0
-    med_pct = round(med_count / total_transactions * 100) if total_transactions else 0
-    high_pct = 100 - low_pct - med_pct if total_transactions else 0
-
-    # Top triggered rules (for display)
-    top_rules = [
-        {"ruleId": rid, "count": cnt}
-        for rid, cnt in rule_counter.most_common(5)
-    ]
-
-    # Threat trend — scores over last N transactions (newest last)
-    threat_trend = [
-        txn.get("riskResult", {}).get("score", 0)
-        for txn in reversed(history[:12])
-    ]
-
-    return {
-        "totalTransactions": total_transactions,
-        "flaggedCount": flagged_count,
-        "blockedCount": blocked_count,
-        "moneySaved": money_saved,
-        "safeCount": safe_count,
-        "securityScore": security_score,
-        "trustRate": trust_rate,
-        "avgRiskScore": round(avg_risk, 1),
-        "totalAmount": total_amount,
-        "recentTransactions": recent,
-        "riskDistribution": {
-            "low": {"count": low_count, "pct": low_pct},
-            "medium": {"count": med_count, "pct": med_pct},
-            "high": {"count": high_count, "pct": high_pct},
-        },
-        "topRules": top_rules,
-        "threatTrend": threat_trend,
-        "hourlyDistribution": hourly_dist,
-        "rulesEvaluated": 9,
-    }
\ No newline at end of file
+def calculate_dashboard_stats(history: List[dict]):
+    """Compute dashboard stats from scratch over a newest-first history."""
+    aggregates = DashboardAggregates()
+    for txn in reversed(history):
+        aggregates.add(txn)
+    return aggregates.stats()
@@ -0,0 +1,98 @@
+from typing import Callable, List, Optional
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+import orjson
+
+from core.metrics import DECISION_TOKENS
+from json_response import dumps
+
+# ═══════════════════════════════════════════════════
+# DECISION TOKENS — score once for analyze → send
+#
+# /api/analyze signs its result together with what it depended on: the
+# user, a digest of the payload, the user's store version, the active
+# rule config and blocklist (the `rules` argument) and the scoring mode. /api/send reuses the result if the
+# token is intact, unexpired and all of those still match; otherwise it
+# scores the payment again. The token is self-contained, so any worker
+# holding the same secret can redeem it.
+#
+# Recipient reputation changes with every user's payments, so it is not
+# signed; the caller re-checks verdicts like that through `recheck`.
+# ═══════════════════════════════════════════════════
+
+# Tokens are short-lived: NIGHT_OWL / HIGH_FREQUENCY depend on the clock
+TOKEN_TTL_SECONDS = 120
+
+# Without a configured secret each process signs with its own random key:
+# tokens then only redeem on the worker that issued them (others re-score).
+# Workers forked from a preloading gunicorn master share the master's key.
+_env_secret = os.environ.get("SECUREFLOW_DECISION_SECRET", "")
+EPHEMERAL_SECRET = not _env_secret
+# BLAKE2b keys are at most 64 bytes: longer secrets are hashed down to one
+_KEY = hashlib.blake2b(_env_secret.encode()).digest() if _env_secret else secrets.token_bytes(32)
+
+
+def _sign(body: bytes) -> str:
+    # Keyed BLAKE2b is a MAC in its own right and much cheaper than HMAC-SHA256
+    return hashlib.blake2b(body, key=_KEY, digest_size=16).hexdigest()
+
+
+def payload_digest(payload) -> str:
+    """Digest of the fields that were scored (after request validation)."""
+    fields = f"{payload.recipientUPI}\x00{payload.amount!r}\x00{payload.remarks}".encode()
+    return hashlib.blake2b(fields, digest_size=12).hexdigest()
+
+
+def _expiry(now: float) -> int:
+    # Never outlive the current hour: the NIGHT_OWL verdict can change at the boundary
+    return int(min(now + TOKEN_TTL_SECONDS, (now // 3600 + 1) * 3600))
+
+
+def issue(user_id: str, payload, version: int, rules: str, mode: str,
+          score: int, reasons: List[dict], evaluated: int) -> str:
+    """Sign a scoring result; `reasons` are the response's reason dicts."""
+    claims = {
+        "u": user_id, "p": payload_digest(payload), "v": version, "r": rules, "m": mode,
+        "e": _expiry(time.time()), "s": score, "n": evaluated, "x": reasons,
+    }
+    # Tokens travel in JSON bodies, not URLs, so plain base64 is fine
+    body = base64.b64encode(dumps(claims))
+    return f"{body.decode()}.{_sign(body)}"
+
+
+def redeem(token: str, user_id: str, payload, version: int, rules: str, mode: str,
+           recheck: Optional[Callable[[List[dict]], bool]] = None) -> Optional[dict]:
+    """
+    The signed result ({"score", "reasons", "evaluated"}) if `token` is
+    valid for exactly this request and nothing it depended on changed;
+    None means score again. recheck(reasons) returning True also marks
+    the result stale.
+    """
+    body, _, signature = token.encode().partition(b".")
+    if not hmac.compare_digest(signature, _sign(body).encode()):
+        DECISION_TOKENS.inc("invalid")
+        return None
+    try:
+        claims = orjson.loads(base64.b64decode(body))
+    except (binascii.Error, ValueError):
+        DECISION_TOKENS.inc("invalid")
+        return None
+
+    if claims["u"] != user_id or claims["p"] != payload_digest(payload) or claims["m"] != mode:
+        DECISION_TOKENS.inc("mismatch")
+        return None
+    if claims["e"] < time.time() or claims["v"] != version or claims["r"] != rules:
+        DECISION_TOKENS.inc("stale")
+        return None
+    if recheck is not None and recheck(claims["x"]):
+        DECISION_TOKENS.inc("stale")
+        return None
+
+    DECISION_TOKENS.inc("reused")
+    return {"score": claims["s"], "reasons": claims["x"], "evaluated": claims["n"]}
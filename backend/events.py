@@ -0,0 +1,146 @@
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import logging
+
+from json_response import dumps
+
+logger = logging.getLogger("secureflow")
+
+# ═══════════════════════════════════════════════════
+# SERVER-SENT EVENTS — one fan-out channel per user
+#
+# /api/send publishes each committed transaction (and the refreshed
+# dashboard stats) once per user: the frame is serialized once and the
+# same bytes are queued to every open stream of that user. Work grows
+# with writes, not with the number of open dashboards.
+#
+# Events:  transaction  the committed transaction
+#          stats        dashboard stats after it
+#          reset        history was cleared — refetch
+#          sync         changed elsewhere (another worker) — refetch
+# ═══════════════════════════════════════════════════
+
+# Frames buffered per stream; a client that falls this far behind is
+# disconnected (EventSource reconnects and refetches)
+QUEUE_SIZE = 64
+
+# Idle streams get a comment line this often, so proxies keep them open
+# and a vanished client is noticed
+HEARTBEAT_SECONDS = 15.0
+
+# How often a channel checks a shared store's version for writes made
+# by other processes (only when the user has open streams)
+WATCH_SECONDS = 2.0
+
+HEARTBEAT = b": ping\n\n"
+
+
+def frame(event: str, data) -> bytes:
+    """One SSE message."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class _Channel:
+    __slots__ = ("queues", "version", "watcher")
+
+    def __init__(self):
+        self.queues: Set[asyncio.Queue] = set()
+        self.version: Optional[int] = None        # last store version seen by the watcher
+        self.watcher: Optional[asyncio.Task] = None
+
+
+class Broadcaster:
+    """
+    Per-user fan-out of SSE frames, for one event loop.
+
+    `version_of`, if given, is awaited every WATCH_SECONDS per watched
+    user; a change not announced locally becomes a `sync` event. Used
+    when other processes write to the same store.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, _Channel] = {}
+
+    def subscribe(self, user_id: str,
+                  version_of: Callable[[str], Awaitable[int]] | None = None) -> asyncio.Queue:
+        channel = self._channels.get(user_id)
+        if channel is None:
+            channel = self._channels[user_id] = _Channel()
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        channel.queues.add(queue)
+        if version_of is not None and channel.watcher is None:
+            channel.watcher = asyncio.create_task(self._watch(user_id, channel, version_of))
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        channel = self._channels.get(user_id)
+        if channel is None:
+            return
+        channel.queues.discard(queue)
+        if not channel.queues:
+            if channel.watcher is not None:
+                channel.watcher.cancel()
+            del self._channels[user_id]
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._channels
+
+    def stream_count(self) -> int:
+        return sum(len(channel.queues) for channel in list(self._channels.values()))
+
+    def publish(self, user_id: str, event: str, data, version: int | None = None) -> int:
+        """
+        Queue one event to every stream of `user_id`; returns how many got it.
+        `version` is the store version the event brings clients up to.
+        """
+        channel = self._channels.get(user_id)
+        if channel is None:
+            return 0
+        if version is not None:
+            channel.version = max(channel.version or 0, version)
+        message = frame(event, data)
+        for queue in list(channel.queues):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow: drop its backlog and tell the stream to close
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                channel.queues.discard(queue)
+        return len(channel.queues)
+
+    async def _watch(self, user_id: str, channel: _Channel, version_of):
+        while True:
+            try:
+                version = await version_of(user_id)
+                if channel.version is None:
+                    channel.version = version
+                elif version > channel.version:
+                    self.publish(user_id, "sync", {"version": version}, version)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event watcher for %s failed", user_id)
+            await asyncio.sleep(WATCH_SECONDS)
+
+
+broadcaster = Broadcaster()
+
+
+async def stream(user_id: str, version_of=None):
+    """Async iterator of SSE bytes for one client, until it disconnects or falls behind."""
+    queue = broadcaster.subscribe(user_id, version_of)
+    try:
+        yield b"retry: 3000\n\n" + frame("ready", {"user": user_id})
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                message = HEARTBEAT
+            if message is None:
+                return
+            yield message
+    finally:
+        broadcaster.unsubscribe(user_id, queue)
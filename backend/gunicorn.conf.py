@@ -0,0 +1,53 @@
+"""
+Multi-process deployment: gunicorn managing uvicorn workers.
+
+    gunicorn app:app -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) — rule registry,
+keyword automaton, UPI patterns, blocklist mapping — and workers inherit
+it copy-on-write. Workers share users, history and profiles through
+the SQLite store; the recipient reputation table behind BAD_REPUTATION
+is not shared — each worker learns only from the sends it serves.
+
+Environment:
+    WEB_CONCURRENCY     worker processes (default: one per available CPU)
+    PORT                listen port (default 5000)
+    SECUREFLOW_STORE    defaults to sqlite:secureflow.db here — the
+                        in-memory store would give every worker its own history
+"""
+import gc
+import os
+
+# Must be decided before the app is imported below
+os.environ.setdefault("SECUREFLOW_STORE", "sqlite:secureflow.db")
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))   # respects container CPU pinning
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+try:
+    import uvicorn_worker  # noqa: F401 — maintained home of the worker class
+    worker_class = "uvicorn_worker.UvicornWorker"
+except ImportError:
+    worker_class = "uvicorn.workers.UvicornWorker"
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", _cpus()))
+preload_app = True
+
+# /api/events streams never end on their own: cap how long a restart
+# waits for them (EventSource reconnects to the new workers)
+graceful_timeout = 20
+keepalive = 5
+
+
+def when_ready(server):
+    # Everything imported by preload is long-lived: move it out of the GC's
+    # reach so collections in the workers don't touch (and copy) its pages
+    gc.freeze()
+    server.log.info("SecureFlow: %d %s workers, store %s",
+                    workers, worker_class, os.environ["SECUREFLOW_STORE"])
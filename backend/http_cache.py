@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+import hashlib
+import os
+import threading
+
+from fastapi import Request, Response
+
+from json_response import dumps
+
+# ═══════════════════════════════════════════════════
+# RESPONSE CACHE — serialized bytes + ETags keyed by store version
+#
+# GET handlers whose output only changes when the store's per-user
+# version does (history pages, user record, dashboard) are served from
+# the bytes produced last time. The ETag is derived from the version, so
+# a client that already holds it gets an empty 304 — no query, no
+# serialization, no body.
+# ═══════════════════════════════════════════════════
+
+# Entries kept per process (one per user × endpoint × query)
+MAX_ENTRIES = 2048
+
+# Memory budget for the cached bodies: history pages run up to ~1 MB each
+MAX_BYTES = int(float(os.environ.get("SECUREFLOW_RESPONSE_CACHE_MB", "32")) * 1024 * 1024)
+
+# Estimated per-entry cost beyond the body (key, ETag, headers, LRU node)
+_ENTRY_BYTES = 400
+
+# The browser keeps the body but revalidates before every use
+CACHE_CONTROL = "private, no-cache"
+
+Builder = Callable[[], Awaitable[Tuple[object, Dict[str, str]]]]
+
+
+class ResponseCache:
+    """Thread-safe LRU under an entry and byte budget: key → (etag, body bytes, extra headers)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[tuple, Tuple[str, bytes, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(entry) -> int:
+        return _ENTRY_BYTES + len(entry[1])
+
+    def get(self, key: tuple, etag: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, etag: str, body: bytes, headers: Dict[str, str]):
+        entry = (etag, body, headers)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= self._size(old)
+            if self._size(entry) > self.max_bytes:
+                return                   # would evict everything else
+            self._entries[key] = entry
+            self.bytes += self._size(entry)
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self.bytes -= self._size(self._entries.popitem(last=False)[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+_cache = ResponseCache()
+
+
+def make_etag(key: tuple, version) -> str:
+    """Strong ETag for `key` at `version` (any str()-able value)."""
+    digest = hashlib.blake2b(repr((key, version)).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+async def cached_json(request: Request, key: tuple, version, build: Builder) -> Response:
+    """
+    Serve `key` at `version` as JSON: 304 if the client's If-None-Match
+    already names it, cached bytes if this process built it before,
+    otherwise await build() → (content, extra headers) and cache the result.
+
+    Read `version` before building, so a concurrent write can only make
+    the cached body newer than its tag, never older.
+    """
+    etag = make_etag(key, version)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    entry = _cache.get(key, etag)
+    if entry is None:
+        content, extra = await build()
+        entry = (etag, dumps(content), extra)
+        _cache.put(key, *entry)
+    _, body, extra = entry
+    return Response(body, media_type="application/json", headers={**extra, **headers})
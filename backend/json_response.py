@@ -0,0 +1,35 @@
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+# ═══════════════════════════════════════════════════
+# JSON RESPONSES — orjson straight to bytes
+#
+# Handlers on the hot path build plain dicts from models the engine has
+# already validated and return them through FastJSONResponse, which skips
+# FastAPI's response_model re-validation and the stdlib encoder.
+# ═══════════════════════════════════════════════════
+
+# Non-string dict keys (e.g. ints) and NumPy scalars / arrays are allowed
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def model_dict(model) -> dict:
+    """
+    Field values of a flat, already-validated model (no nested models, no
+    extras) as a new dict. Several times cheaper than model_dump().
+    """
+    return dict(model.__dict__)
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, as sent in responses."""
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (dicts, lists and Pydantic-free data only)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,127 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+# ═══════════════════════════════════════════════════
+# LOGGING — structured JSON, written off the request path
+#
+# Request handlers only build a LogRecord and put it on a queue. A
+# background QueueListener thread formats it as one JSON line and writes
+# it to stderr, so a slow or blocked stderr never stalls a request.
+# Hot-path events are sampled per route; BLOCK decisions always go out.
+# ═══════════════════════════════════════════════════
+
+logger = logging.getLogger("secureflow")
+
+# Fraction of events logged per route. Override with e.g.
+#   SECUREFLOW_LOG_SAMPLE="analyze=0.01,send=1"
+DEFAULT_SAMPLE_RATES = {"analyze": 0.1, "batch": 1.0, "send": 1.0}
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus any `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue the record untouched. The stock prepare() formats the message
+    in the caller's thread; here %-args and extra fields are only rendered
+    by the listener. Records never leave the process, so nothing needs to
+    be made picklable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _parse_rates(spec: str) -> dict:
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        route, _, rate = part.partition("=")
+        try:
+            rates[route.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            print(f"Ignoring bad SECUREFLOW_LOG_SAMPLE entry: {part!r}", file=sys.stderr)
+    return rates
+
+
+_sample_rates = _parse_rates(os.environ.get("SECUREFLOW_LOG_SAMPLE", ""))
+_listener: logging.handlers.QueueListener | None = None
+_handler: _LazyQueueHandler | None = None
+
+
+def sampled(route: str) -> bool:
+    """True if this event on `route` should be logged under its sample rate."""
+    rate = _sample_rates.get(route, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+def log_decision(route: str, action: str, **fields):
+    """
+    Log one risk decision as structured fields. BLOCK is always logged
+    (audit trail); everything else is sampled per route.
+    """
+    if action == "BLOCK" or sampled(route):
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("risk decision", extra={"route": route, "action": action, **fields})
+
+
+def setup_logging(level: int = logging.INFO):
+    """Route the root logger through a queue to a background JSON writer (idempotent)."""
+    global _handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter())
+    records = _start_listener(output)
+    _handler = _LazyQueueHandler(records)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def _start_listener(output: logging.Handler) -> queue.SimpleQueue:
+    global _listener
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)   # flush what is still queued on shutdown
+    return records
+
+
+def _restart_in_child():
+    """
+    The listener thread does not survive fork() (gunicorn preloads the app
+    in its master): give the child its own queue and thread, or its records
+    would pile up unwritten. Records the parent had queued stay the parent's.
+    """
+    _handler.queue = _start_listener(*_listener.handlers)
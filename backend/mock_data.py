@@ -1,20 +1,17 @@
 from datetime import datetime, timedelta
-import uuid
 
 # ═══════════════════════════════════════════════════
-# IN-MEMORY TRANSACTION STORE  (acts as DB for demo)
+# DEMO SEED DATA  (loaded into an empty store)
 # ═══════════════════════════════════════════════════
 
-_transactions: list[dict] = []
-_initialized = False
 
-
-def _seed():
-    """Seed realistic transaction history on first access."""
-    global _initialized
-    if _initialized:
+def seed_store(store):
+    """Seed realistic transaction history the first time a store is used."""
+    if not store.claim_seed():
         return
-    _initialized = True
+
+    store.put_user(MOCK_USER)
+    store.set_balance(MOCK_USER["id"], INITIAL_BALANCE)
 
     now = datetime.utcnow()
 
@@ -354,40 +351,21 @@ def _seed():
     ]
 
     for item in seed_data:
-        item["id"] = f"TXN-{uuid.uuid4().hex[:6].upper()}"
-        _transactions.append(item)
-
-
-def get_mock_history() -> list[dict]:
-    """Return the full in-memory transaction list (most-recent first)."""
-    _seed()
-    return list(reversed(_transactions))
-
-
-def add_transaction(txn: dict):
-    """Append a new transaction and return it."""
-    _seed()
-    txn["id"] = f"TXN-{uuid.uuid4().hex[:6].upper()}"
-    _transactions.append(txn)
-    return txn
-
-
-def reset_history():
-    """Clear all transactions and reset user balance."""
-    global _initialized
-    _transactions.clear()
-    _initialized = True          # skip re-seeding
-    MOCK_USER["balance"] = 84750.50
+        store.add(MOCK_USER["id"], item)
 
 
 # ═══════════════════════════════════════════════════
 # MOCK USER
 # ═══════════════════════════════════════════════════
 
+INITIAL_BALANCE = 84750.50   # the live balance is kept in the store
+
+# Requests without an X-User-Id header act as this demo user
+
 MOCK_USER = {
     "id": "USR-001",
     "name": "Aarav Patel",
     "upiId": "aarav@secureflow",
-    "balance": 84750.50,
+    "initialBalance": INITIAL_BALANCE,
     "trustedContacts": ["rahul@okaxis", "priya@upi", "a.verma@okicici", "merchant@hdfc"],
 }
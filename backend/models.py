@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional
 
 
@@ -22,6 +22,11 @@ class AnalyzeRequest(BaseModel):
         return v
 
 
+class SendRequest(AnalyzeRequest):
+    # Token from /api/analyze for this payment; lets /api/send skip re-scoring
+    decisionToken: Optional[str] = None
+
+
 class RiskReason(BaseModel):
     ruleId: str
     title: str
@@ -32,6 +37,9 @@ class RiskReason(BaseModel):
 
 
 class FrictionConfig(BaseModel):
+    # Immutable: map_friction() hands out one shared instance per tier
+    model_config = ConfigDict(frozen=True)
+
     type: str
     delaySeconds: int
     canOverride: bool
@@ -45,4 +53,27 @@ class RiskResult(BaseModel):
     recommendedAction: str
     friction: FrictionConfig
     analysisTimeMs: Optional[float] = None
-    rulesEvaluated: Optional[int] = None
\ No newline at end of file
+    rulesEvaluated: Optional[int] = None
+    decisionToken: Optional[str] = None
+
+
+class UserCreate(BaseModel):
+    id: str
+    name: str
+    upiId: str
+    balance: float = 0.0
+    trustedContacts: List[str] = []
+
+    @field_validator("id")
+    @classmethod
+    def id_must_not_be_blank(cls, v: str) -> str:
+        if not v.strip():
+            raise ValueError("User id must not be empty")
+        return v.strip()
+
+    @field_validator("balance")
+    @classmethod
+    def balance_must_not_be_negative(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("Balance cannot be negative")
+        return v
\ No newline at end of file
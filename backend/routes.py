@@ -1,10 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from models import AnalyzeRequest, RiskResult
-from core.risk_engine import analyze_transaction, TOTAL_RULES
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import json
+from models import AnalyzeRequest, RiskResult, SendRequest, UserCreate
+from core.risk_engine import score_transaction, analyze_batch, registry, reputation_verdict_changed, rule_fired
 from core.friction_engine import map_friction
-from core.stats_engine import calculate_dashboard_stats
-from mock_data import get_mock_history, add_transaction, reset_history, MOCK_USER
+from core.profile import UserProfile
+from core.reputation import reputation
+from core.blocklist import blocklist
+from core.stats_engine import DashboardAggregates
+from mock_data import INITIAL_BALANCE, MOCK_USER
+from store import get_store, to_epoch
+from logging_config import log_decision, sampled
+from http_cache import cached_json
+from json_response import FastJSONResponse, model_dict
+from events import broadcaster, stream as event_stream
+import decision_token
 from datetime import datetime, timezone
+from weakref import WeakValueDictionary
+import asyncio
 import logging
 import time
 
@@ -12,65 +27,218 @@ logger = logging.getLogger("secureflow")
 
 router = APIRouter(prefix="/api")
 
-# ───────────────────────────────────────────────────
-# POST /api/analyze — risk-check a potential txn
-# ───────────────────────────────────────────────────
-@router.post("/analyze", response_model=RiskResult)
-def analyze(request: AnalyzeRequest):
-    logger.info(f"Analyzing transaction: {request.recipientUPI} - ₹{request.amount}")
+MAX_BATCH_SIZE = 10_000
 
-    start = time.perf_counter()
+# The dashboard shows relative times ("42s ago"), so its ETag also
+# rolls over every this many seconds even when nothing was recorded
+DASHBOARD_ETAG_SECONDS = 15
 
-    history = get_mock_history()
+# ?mode=fast stops scoring once the friction tier is settled (partial reasons);
+# the default "explain" mode runs every rule for the UI breakdown
+SCORING_MODE = Query("explain", pattern="^(explain|fast)$")
+
+# One asyncio lock per user for the score → record → debit section of
+# /api/send. Unrelated users never wait on each other; entries disappear
+# once no request holds them.
+_send_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+
+def _send_lock(user_id: str) -> asyncio.Lock:
+    lock = _send_locks.get(user_id)
+    if lock is None:
+        lock = _send_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+# X-User-Id for handlers that look the caller up themselves, in the same
+# store call as their other reads (parameter must be named x_user_id)
+CALLER = Header(MOCK_USER["id"])
+
+
+def _lookup_user(store, user_id: str) -> dict:
+    """The caller's user record, or 404 (a plain store call, for grouped reads)."""
+    user = store.user(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail=f"Unknown user '{user_id}'.")
+    return user
 
-    score, reasons = analyze_transaction(
-        request, history, trusted_contacts=MOCK_USER.get("trustedContacts")
-    )
 
+def _user_and_version(store, user_id: str) -> tuple:
+    return _lookup_user(store, user_id), store.version(user_id)
+
+
+async def current_user(x_user_id: str = Header(MOCK_USER["id"])) -> dict:
+    """Resolve the caller from the X-User-Id header (defaults to the demo user)."""
+    store = get_store()
+    return await store.arun(_lookup_user, store, x_user_id)
+
+
+def _apply_contributions(score: int, reasons):
+    """Fill in each reason's share of the final score."""
     if score > 0:
         for reason in reasons:
             reason.contributionPercent = round(
                 (abs(reason.scoreAdded) / max(score, 1)) * 100, 2
             )
 
+
+def _score(profile, request, trusted_contacts, fast: bool):
+    """score_transaction with the profile first, for store.read_profile()."""
+    return score_transaction(request, profile, trusted_contacts=trusted_contacts, fast=fast)
+
+
+def _decision_inputs() -> str:
+    """What a decision token pins besides the user and payload: rule config and blocklist."""
+    return f"{registry.active.digest}:{blocklist.digest}"
+
+
+def _risk_result(score: int, level: str, reasons: List[dict], action: str, friction,
+                 elapsed_ms: float | None, evaluated: int) -> dict:
+    """
+    RiskResult as a plain dict. The reasons and friction tier were
+    validated when the engine built them, so they are not wrapped in a
+    RiskResult model and validated again.
+    """
+    return {
+        "score": score,
+        "level": level,
+        "reasons": reasons,
+        "recommendedAction": action,
+        "friction": model_dict(friction),
+        "analysisTimeMs": elapsed_ms,
+        "rulesEvaluated": evaluated,
+    }
+
+
+# ───────────────────────────────────────────────────
+# POST /api/analyze — risk-check a potential txn
+# (response_model documents the schema; the handler returns
+# FastJSONResponse, so FastAPI does not re-validate it)
+# ───────────────────────────────────────────────────
+def _analyze_reads(store, user_id: str, request, fast: bool) -> tuple:
+    """Caller, token inputs and score: one thread hop on a blocking store."""
+    user = _lookup_user(store, user_id)
+    # Read before scoring: any commit or reload after this point invalidates the token
+    version = store.version(user_id)
+    inputs = _decision_inputs()
+    scored = store.read_profile(user_id, _score, request, user.get("trustedContacts"), fast)
+    return (user, version, inputs, *scored)
+
+
+@router.post("/analyze", response_model=RiskResult)
+async def analyze(request: AnalyzeRequest, x_user_id: str = CALLER, mode: str = SCORING_MODE):
+    start = time.perf_counter()
+    store = get_store()
+
+    user, version, inputs, score, reasons, evaluated = await store.arun(
+        _analyze_reads, store, x_user_id, request, mode == "fast"
+    )
+
+    _apply_contributions(score, reasons)
+    reasons = [model_dict(r) for r in reasons]
+
     level, action, friction = map_friction(score)
 
     elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
-    logger.info(f"Risk score: {score} ({level}) — {elapsed_ms}ms")
-
-    return RiskResult(
-        score=score,
-        level=level,
-        reasons=reasons,
-        recommendedAction=action,
-        friction=friction,
-        analysisTimeMs=elapsed_ms,
-        rulesEvaluated=TOTAL_RULES,
+    log_decision(
+        "analyze", action, user=user["id"], recipient=request.recipientUPI,
+        amount=request.amount, score=score, ms=elapsed_ms,
+    )
+
+    result = _risk_result(score, level, reasons, action, friction, elapsed_ms, evaluated)
+    result["decisionToken"] = decision_token.issue(
+        user["id"], request, version, inputs, mode, score, reasons, evaluated
     )
+    return FastJSONResponse(result)
 
 
 # ───────────────────────────────────────────────────
-# POST /api/send — analyse, record, and "send" a txn
+# POST /api/analyze/batch — risk-check many txns at once
 # ───────────────────────────────────────────────────
-@router.post("/send")
-def send(request: AnalyzeRequest):
-    logger.info(f"Send request: {request.recipientUPI} - ₹{request.amount}")
+def _score_batch(store, user_id: str, requests) -> tuple:
+    """Caller lookup, profile snapshot and scoring, all on one worker thread."""
+    user = _lookup_user(store, user_id)
+    # Score a snapshot so commits can keep updating the live profile meanwhile
+    profile = store.read_profile(user_id, UserProfile.copy)
+    return user, analyze_batch(requests, profile, trusted_contacts=user.get("trustedContacts"))
 
-    if request.amount > MOCK_USER["balance"]:
-        raise HTTPException(status_code=400, detail="Insufficient balance.")
+
+@router.post("/analyze/batch", response_model=List[RiskResult])
+async def analyze_many(requests: List[AnalyzeRequest], x_user_id: str = CALLER):
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"Batch too large (max {MAX_BATCH_SIZE} items)."
+        )
 
     start = time.perf_counter()
 
-    history = get_mock_history()
-    score, reasons = analyze_transaction(
-        request, history, trusted_contacts=MOCK_USER.get("trustedContacts")
-    )
+    # Large batches are CPU-bound: keep them off the event loop
+    user, scored = await run_in_threadpool(_score_batch, get_store(), x_user_id, requests)
 
-    if score > 0:
-        for reason in reasons:
-            reason.contributionPercent = round(
-                (abs(reason.scoreAdded) / max(score, 1)) * 100, 2
-            )
+    total_rules = registry.total_rules
+    results = []
+    for score, reasons in scored:
+        _apply_contributions(score, reasons)
+        level, action, friction = map_friction(score)
+        results.append(_risk_result(
+            score, level, [model_dict(r) for r in reasons], action, friction, None, total_rules
+        ))
+
+    # Report the amortised per-item time so it is comparable with /analyze
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    per_item_ms = round(elapsed_ms / max(len(results), 1), 4)
+    for result in results:
+        result["analysisTimeMs"] = per_item_ms
+
+    if sampled("batch"):
+        logger.info("batch scored", extra={
+            "route": "batch", "user": user["id"], "items": len(results), "ms": round(elapsed_ms, 2),
+        })
+
+    return FastJSONResponse(results)
+
+
+# ───────────────────────────────────────────────────
+# POST /api/send — analyse, record, and "send" a txn
+# ───────────────────────────────────────────────────
+def _sender(store, user_id: str, amount: float) -> dict:
+    user = _lookup_user(store, user_id)
+    # Cheap early rejection; the authoritative check is the atomic debit
+    if amount > store.balance(user_id):
+        raise HTTPException(status_code=400, detail="Insufficient balance.")
+    return user
+
+
+def _decide_and_commit(store, user: dict, request, mode: str) -> tuple:
+    """
+    The locked part of /api/send: reuse or compute the decision, then
+    record + debit. All of its store calls make one thread hop on a
+    blocking store. Returns (txn or None, score, action, status,
+    elapsed ms, whether the token's decision was reused).
+    """
+    start = time.perf_counter()
+    user_id = user["id"]
+
+    # Reuse the /api/analyze result if nothing it depended on has changed
+    decision = None
+    if request.decisionToken:
+        # A replaced blocklist must void tokens now, not at the next interval check
+        registry.maybe_reload()
+        blocklist.maybe_reload(force=True)
+        decision = decision_token.redeem(
+            request.decisionToken, user_id, request,
+            store.version(user_id), _decision_inputs(), mode,
+            recheck=lambda reasons: reputation_verdict_changed(request, reasons),
+        )
+
+    if decision is not None:
+        score, reasons, evaluated = decision["score"], decision["reasons"], decision["evaluated"]
+    else:
+        score, reasons, evaluated = store.read_profile(
+            user_id, _score, request, user.get("trustedContacts"), mode == "fast"
+        )
+        _apply_contributions(score, reasons)
+        reasons = [model_dict(r) for r in reasons]
 
     level, action, friction = map_friction(score)
 
@@ -79,21 +247,13 @@ def send(request: AnalyzeRequest):
 
     elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
 
-    # Build risk result dict
-    risk_result = {
-        "score": score,
-        "level": level,
-        "reasons": [r.model_dump() for r in reasons],
-        "recommendedAction": action,
-        "friction": friction.model_dump(),
-        "analysisTimeMs": elapsed_ms,
-        "rulesEvaluated": TOTAL_RULES,
-    }
+    risk_result = _risk_result(score, level, reasons, action, friction, elapsed_ms, evaluated)
 
     # Derive a display name from the UPI id
     upi_user = request.recipientUPI.split("@")[0].replace(".", " ").replace("_", " ").title()
 
-    txn = add_transaction({
+    # Record + deduct balance (if completed) as one atomic step
+    txn = store.commit(user_id, {
         "recipientUPI": request.recipientUPI,
         "recipientName": upi_user,
         "amount": request.amount,
@@ -101,46 +261,198 @@ def send(request: AnalyzeRequest):
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "status": status,
         "riskResult": risk_result,
-    })
+    }, debit=request.amount if status == "completed" else 0.0)
+    return txn, score, action, status, elapsed_ms, decision is not None
+
 
-    # Deduct balance if completed
-    if status == "completed":
-        MOCK_USER["balance"] = round(MOCK_USER["balance"] - request.amount, 2)
+@router.post("/send")
+async def send(request: SendRequest, x_user_id: str = CALLER, mode: str = SCORING_MODE):
+    store = get_store()
+    user = await store.arun(_sender, store, x_user_id, request.amount)
+    user_id = user["id"]
 
-    return txn
+    async with _send_lock(user_id):
+        txn, score, action, status, elapsed_ms, reused = await store.arun(
+            _decide_and_commit, store, user, request, mode
+        )
+
+    if txn is None:
+        raise HTTPException(status_code=400, detail="Insufficient balance.")
+
+    # Every user's committed payments feed the recipient's shared reputation,
+    # except blocks BAD_REPUTATION took part in: those echo the table's own
+    # verdict back into it and would keep a recipient flagged indefinitely
+    if status != "blocked" or not rule_fired(txn["riskResult"]["reasons"], "BAD_REPUTATION"):
+        reputation.record(request.recipientUPI, user_id, blocked=status == "blocked")
+
+    if broadcaster.has_subscribers(user_id):
+        await _announce(store, user_id, txn)
+
+    log_decision(
+        "send", action, user=user_id, txn=txn["id"], recipient=request.recipientUPI,
+        amount=request.amount, score=score, status=status, ms=elapsed_ms, reused=reused,
+    )
+    return FastJSONResponse(txn)
+
+
+def _version_and_stats(store, user_id: str) -> tuple:
+    return store.version(user_id), store.read_dashboard(user_id, DashboardAggregates.stats)
+
+
+async def _announce(store, user_id: str, txn: dict):
+    """Push a committed transaction and the refreshed stats to the user's open streams."""
+    version, stats = await store.arun(_version_and_stats, store, user_id)
+    broadcaster.publish(user_id, "transaction", txn, version)
+    broadcaster.publish(user_id, "stats", stats, version)
+
+
+def _history_filters(status, level, recipient, since, until) -> dict:
+    """Validate the shared history query parameters into store filters."""
+    try:
+        return {
+            "status": status,
+            "level": level,
+            "recipient": recipient,
+            "since": to_epoch(since) if since else None,
+            "until": to_epoch(until) if until else None,
+        }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be ISO-8601 timestamps.")
 
 
 # ───────────────────────────────────────────────────
-# GET /api/history — full transaction list
+# GET /api/history — one page of transactions
+# (newest first; next page cursor in X-Next-Cursor)
 # ───────────────────────────────────────────────────
 @router.get("/history")
-def history():
-    return get_mock_history()
+async def history(
+    request: Request,
+    x_user_id: str = CALLER,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    status: Optional[str] = None,
+    level: Optional[str] = None,
+    recipient: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    filters = _history_filters(status, level, recipient, since, until)
+    store = get_store()
+    user, version = await store.arun(_user_and_version, store, x_user_id)
+
+    async def page():
+        items, next_cursor = await store.aquery(user["id"], before=cursor, limit=limit, **filters)
+        return items, ({"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {})
+
+    # Keyed by the parsed parameters: unknown or reordered query
+    # parameters must not each get their own entry
+    key = ("history", user["id"], limit, cursor, *filters.values())
+    return await cached_json(request, key, (store.token, version), page)
+
+
+# ───────────────────────────────────────────────────
+# GET /api/history/export — NDJSON stream of all matches
+# ───────────────────────────────────────────────────
+@router.get("/history/export")
+async def history_export(
+    user: dict = Depends(current_user),
+    status: Optional[str] = None,
+    level: Optional[str] = None,
+    recipient: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    filters = _history_filters(status, level, recipient, since, until)
+
+    async def lines():
+        async for txn in get_store().aiter_history(user["id"], **filters):
+            yield json.dumps(txn) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="secureflow-history.ndjson"'},
+    )
+
+
+# ───────────────────────────────────────────────────
+# GET /api/events — Server-Sent Events for the caller
+# (EventSource cannot send headers, so ?user= may name the user)
+# ───────────────────────────────────────────────────
+@router.get("/events")
+async def events(
+    user_id: Optional[str] = Query(None, alias="user"),
+    x_user_id: str = Header(MOCK_USER["id"]),
+):
+    user = await current_user(user_id or x_user_id)
+    store = get_store()
+    return StreamingResponse(
+        event_stream(user["id"], store.aversion if store.shared else None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ───────────────────────────────────────────────────
 # GET /api/user — current user profile
 # ───────────────────────────────────────────────────
 @router.get("/user")
-def user():
-    return MOCK_USER
+async def user_profile(request: Request, x_user_id: str = CALLER):
+    store = get_store()
+    user, version = await store.arun(_user_and_version, store, x_user_id)
+
+    async def body():
+        return {**user, "balance": await store.abalance(user["id"])}, {}
+
+    return await cached_json(request, ("user", user["id"]), (store.token, version), body)
+
+
+# ───────────────────────────────────────────────────
+# POST /api/users — provision a user partition
+# ───────────────────────────────────────────────────
+@router.post("/users", status_code=201)
+async def create_user(body: UserCreate):
+    store = get_store()
+    if await store.auser(body.id) is not None:
+        raise HTTPException(status_code=409, detail=f"User '{body.id}' already exists.")
+
+    user = {
+        "id": body.id,
+        "name": body.name,
+        "upiId": body.upiId,
+        "initialBalance": body.balance,
+        "trustedContacts": body.trustedContacts,
+    }
+    await store.aput_user(user)
+    await store.aset_balance(body.id, body.balance)
+    return {**user, "balance": body.balance}
 
 
 # ───────────────────────────────────────────────────
 # GET /api/dashboard-stats — aggregate metrics
 # ───────────────────────────────────────────────────
 @router.get("/dashboard-stats")
-def dashboard_stats():
-    history_data = get_mock_history()
-    return calculate_dashboard_stats(history_data)
+async def dashboard_stats(request: Request, x_user_id: str = CALLER):
+    store = get_store()
+    user, version = await store.arun(_user_and_version, store, x_user_id)
+
+    async def stats():
+        return await store.aread_dashboard(user["id"], DashboardAggregates.stats), {}
+
+    bucket = int(time.time() // DASHBOARD_ETAG_SECONDS)
+    return await cached_json(request, ("dashboard", user["id"]), (store.token, version, bucket), stats)
 
 
 # ───────────────────────────────────────────────────
-# POST /api/reset — clear all history
+# POST /api/reset — clear the caller's history
 # ───────────────────────────────────────────────────
 @router.post("/reset")
-def reset():
-    reset_history()
+async def reset(user: dict = Depends(current_user)):
+    store = get_store()
+    await store.areset(user["id"])
+    await store.aset_balance(user["id"], user.get("initialBalance", INITIAL_BALANCE))
+    if broadcaster.has_subscribers(user["id"]):
+        broadcaster.publish(user["id"], "reset", {}, await store.aversion(user["id"]))
     return {"status": "ok", "message": "History cleared"}
 
 
@@ -148,14 +460,15 @@ def reset():
 # GET /api/health
 # ───────────────────────────────────────────────────
 @router.get("/health")
-def health():
+async def health():
     return {
         "status": "SecureFlow backend operational",
         "version": "1.2.0",
         "engines": {
-            "risk":     {"rules": TOTAL_RULES, "status": "active"},
+            "risk":     {"rules": registry.total_rules, "status": "active"},
             "friction": {"tiers": 4, "status": "active"},
             "stats":    {"status": "active"},
+            "reputation": {**reputation.stats(), "status": "active"},
         },
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
     }
\ No newline at end of file
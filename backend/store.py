@@ -0,0 +1,665 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakValueDictionary
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+from core.profile import UserProfile
+from core.stats_engine import DashboardAggregates
+from mock_data import seed_store
+
+# ═══════════════════════════════════════════════════
+# TRANSACTION STORE  (pluggable persistence layer)
+#
+#   SECUREFLOW_STORE=memory              → in-process list (default)
+#   SECUREFLOW_STORE=sqlite:<path.db>    → SQLite in WAL mode, shared
+#                                          by every worker process
+# ═══════════════════════════════════════════════════
+
+# Users whose profile + dashboard views are kept per process. A view
+# holds the user's distinct recipients and at most quantiles.EXACT_LIMIT
+# exact amounts (then a fixed-size sketch); everything else in it is
+# fixed-size. An evicted user's views are rebuilt from their transactions
+# on the next read.
+VIEW_CACHE_USERS = int(os.environ.get("SECUREFLOW_VIEW_CACHE_USERS", "4096"))
+
+
+def to_epoch(ts: str) -> float:
+    """Convert an ISO timestamp (with optional Z suffix) to a UTC epoch."""
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00") if ts.endswith("Z") else ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _matches(txn: dict, status=None, level=None, recipient=None, since=None, until=None) -> bool:
+    """Apply the history filters to a single transaction."""
+    if status is not None and txn.get("status") != status:
+        return False
+    if level is not None and (txn.get("riskResult") or {}).get("level") != level:
+        return False
+    if recipient is not None and txn.get("recipientUPI") != recipient:
+        return False
+    if since is not None and txn["epoch"] < since:
+        return False
+    if until is not None and txn["epoch"] > until:
+        return False
+    return True
+
+
+def _stamp(txn: dict) -> dict:
+    """Assign the id and numeric epoch every stored transaction carries."""
+    txn["id"] = f"TXN-{uuid.uuid4().hex[:6].upper()}"
+    txn["epoch"] = to_epoch(txn["timestamp"])
+    return txn
+
+
+class TransactionStore:
+    """
+    Interface shared by all transaction backends.
+
+    The a*-prefixed coroutines are what async request handlers await.
+    Backends whose calls can block on I/O set `blocking_io = True` and
+    have them dispatched to a worker thread; in-memory calls run inline.
+    """
+
+    blocking_io = False
+
+    # True when other processes may write to the same data (so in-process
+    # change notifications are not enough)
+    shared = False
+
+    # Distinguishes this store's version counters from those of another
+    # store (or of a previous process) that may have reached the same numbers
+    token: str = ""
+
+    def claim_seed(self) -> bool:
+        """Return True exactly once per store, for whoever should seed it."""
+        raise NotImplementedError
+
+    def commit(self, user_id: str, txn: dict, debit: float = 0.0) -> Optional[dict]:
+        """
+        Atomically record a transaction (assigning id + epoch) and debit the
+        user's balance. Returns None, recording nothing, if the balance is
+        lower than `debit`.
+        """
+        raise NotImplementedError
+
+    def add(self, user_id: str, txn: dict) -> dict:
+        """Persist a transaction without touching the balance and return it."""
+        return self.commit(user_id, txn)
+
+    def user(self, user_id: str) -> Optional[dict]:
+        """A user's record (name, upiId, trustedContacts, ...) or None."""
+        raise NotImplementedError
+
+    def put_user(self, user: dict):
+        """Create or replace a user record, keyed by user["id"]."""
+        raise NotImplementedError
+
+    def balance(self, user_id: str) -> float:
+        raise NotImplementedError
+
+    def set_balance(self, user_id: str, amount: float):
+        raise NotImplementedError
+
+    def history(self, user_id: str) -> List[dict]:
+        """All of a user's transactions, most-recent first."""
+        raise NotImplementedError
+
+    def query(
+        self, user_id: str, before: Optional[int] = None, limit: int = 100, **filters
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        One page of a user's transactions, most-recent first.
+
+        `before` is the cursor returned by the previous page (None for the
+        newest page). Filters: status, level, recipient, since / until
+        (epoch seconds, inclusive). Returns (items, next_cursor), where
+        next_cursor is None on the last page.
+        """
+        raise NotImplementedError
+
+    def iter_history(self, user_id: str, page_size: int = 500, **filters):
+        """Yield every matching transaction, most-recent first, one page at a time."""
+        cursor = None
+        while True:
+            items, cursor = self.query(user_id, before=cursor, limit=page_size, **filters)
+            yield from items
+            if cursor is None:
+                return
+
+    def read_profile(self, user_id: str, fn, *args, **kwargs):
+        """
+        Return fn(profile, *args, **kwargs) for the user's up-to-date feature
+        profile, evaluated while no commit can change it. The profile is
+        shared and live: fn must not keep it beyond the call (pass
+        UserProfile.copy to take a snapshot).
+        """
+        raise NotImplementedError
+
+    def read_dashboard(self, user_id: str, fn, *args, **kwargs):
+        """Return fn(dashboard, *args, **kwargs) for the user's dashboard counters (as read_profile)."""
+        raise NotImplementedError
+
+    def reset(self, user_id: str):
+        """Delete a user's transactions."""
+        raise NotImplementedError
+
+    def size(self) -> int:
+        """Total transactions held, across all users (for metrics)."""
+        raise NotImplementedError
+
+    def version(self, user_id: str) -> int:
+        """
+        Counter bumped by every change to what a user's responses show:
+        commits, resets, balance and user-record updates. Equal versions
+        mean identical history / user / dashboard data.
+        """
+        raise NotImplementedError
+
+    # ── awaitable API for async handlers ──────────────
+    async def _run(self, fn, *args, **kwargs):
+        if self.blocking_io:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def arun(self, fn, *args, **kwargs):
+        """
+        Await fn(*args, **kwargs) the way this store runs its own calls.
+        Lets a handler make several store calls in one thread hop instead
+        of one hop per a* call.
+        """
+        return await self._run(fn, *args, **kwargs)
+
+    async def acommit(self, user_id: str, txn: dict, debit: float = 0.0) -> Optional[dict]:
+        return await self._run(self.commit, user_id, txn, debit)
+
+    async def aadd(self, user_id: str, txn: dict) -> dict:
+        return await self._run(self.add, user_id, txn)
+
+    async def auser(self, user_id: str) -> Optional[dict]:
+        return await self._run(self.user, user_id)
+
+    async def aput_user(self, user: dict):
+        return await self._run(self.put_user, user)
+
+    async def abalance(self, user_id: str) -> float:
+        return await self._run(self.balance, user_id)
+
+    async def aset_balance(self, user_id: str, amount: float):
+        return await self._run(self.set_balance, user_id, amount)
+
+    async def aquery(self, user_id: str, before: Optional[int] = None, limit: int = 100, **filters):
+        return await self._run(self.query, user_id, before, limit, **filters)
+
+    async def aread_profile(self, user_id: str, fn, *args, **kwargs):
+        return await self._run(self.read_profile, user_id, fn, *args, **kwargs)
+
+    async def aread_dashboard(self, user_id: str, fn, *args, **kwargs):
+        return await self._run(self.read_dashboard, user_id, fn, *args, **kwargs)
+
+    async def areset(self, user_id: str):
+        return await self._run(self.reset, user_id)
+
+    async def aversion(self, user_id: str) -> int:
+        return await self._run(self.version, user_id)
+
+    async def aiter_history(self, user_id: str, page_size: int = 500, **filters):
+        """Async variant of iter_history()."""
+        cursor = None
+        while True:
+            items, cursor = await self.aquery(user_id, before=cursor, limit=page_size, **filters)
+            for txn in items:
+                yield txn
+            if cursor is None:
+                return
+
+
+class KeyedLocks:
+    """
+    One lock per key, created on demand — unrelated keys never contend.
+    Entries disappear once no thread holds or waits on them.
+    """
+
+    def __init__(self):
+        self._locks: "WeakValueDictionary[str, threading.Lock]" = WeakValueDictionary()
+        self._guard = threading.Lock()
+
+    def __getitem__(self, key: str) -> threading.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+
+
+class ViewCache:
+    """
+    Thread-safe LRU of per-user derived views, at most `max_users` of
+    them. It only guards its own structure: callers hold the user's lock
+    while they read, build or fold into that user's entry.
+    """
+
+    def __init__(self, max_users: int = VIEW_CACHE_USERS):
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[tuple]:
+        with self._guard:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id: str, entry: tuple):
+        with self._guard:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def pop(self, user_id: str):
+        with self._guard:
+            self._entries.pop(user_id, None)
+
+
+# ───────────────────────────────────────────────────
+# In-memory backend — single process, lost on restart
+# ───────────────────────────────────────────────────
+class InMemoryStore(TransactionStore):
+
+    def __init__(self):
+        self._transactions: Dict[str, List[dict]] = {}
+        # user_id → (profile, dashboard), rebuilt from _transactions once evicted
+        self._views_cache = ViewCache()
+        self._balances: Dict[str, float] = {}
+        self._users: Dict[str, dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._locks = KeyedLocks()
+        self._seeded = False
+        self.token = uuid.uuid4().hex[:8]
+
+    def claim_seed(self) -> bool:
+        if self._seeded:
+            return False
+        self._seeded = True
+        return True
+
+    def commit(self, user_id, txn, debit=0.0):
+        with self._locks[user_id]:
+            balance = self._balances.get(user_id, 0.0)
+            if debit > balance:
+                return None
+            _stamp(txn)
+            self._transactions.setdefault(user_id, []).append(txn)
+            views = self._views_cache.get(user_id)
+            if views is not None:       # otherwise the next read builds them, with txn
+                views[0].add(txn)
+                views[1].add(txn)
+            if debit:
+                self._balances[user_id] = round(balance - debit, 2)
+            self._bump(user_id)
+        return txn
+
+    def _bump(self, user_id: str):
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def user(self, user_id: str) -> Optional[dict]:
+        return self._users.get(user_id)
+
+    def put_user(self, user: dict):
+        with self._locks[user["id"]]:
+            self._users[user["id"]] = dict(user)
+            self._bump(user["id"])
+
+    def balance(self, user_id: str) -> float:
+        return self._balances.get(user_id, 0.0)
+
+    def set_balance(self, user_id: str, amount: float):
+        with self._locks[user_id]:
+            self._balances[user_id] = amount
+            self._bump(user_id)
+
+    def history(self, user_id: str) -> List[dict]:
+        return list(reversed(self._transactions.get(user_id, [])))
+
+    def query(self, user_id, before=None, limit=100, **filters):
+        # Cursors are 1-based positions in the append-only per-user list,
+        # matching the SQLite seq semantics (exclusive upper bound)
+        txns = self._transactions.get(user_id, [])
+        pos = len(txns) if before is None else min(before - 1, len(txns))
+        items, last = [], None
+        while pos > 0:
+            txn = txns[pos - 1]
+            if _matches(txn, **filters):
+                if len(items) == limit:
+                    return items, last
+                items.append(txn)
+                last = pos
+            pos -= 1
+        return items, None
+
+    def _user_views(self, user_id: str) -> tuple:
+        """The user's cached (profile, dashboard), built if absent (caller holds the user's lock)."""
+        views = self._views_cache.get(user_id)
+        if views is None:
+            views = (UserProfile(), DashboardAggregates())
+            for txn in self._transactions.get(user_id, ()):
+                views[0].add(txn)
+                views[1].add(txn)
+            self._views_cache.put(user_id, views)
+        return views
+
+    # Commits fold into the views under the user's lock, so readers take it too
+    def read_profile(self, user_id, fn, *args, **kwargs):
+        with self._locks[user_id]:
+            return fn(self._user_views(user_id)[0], *args, **kwargs)
+
+    def read_dashboard(self, user_id, fn, *args, **kwargs):
+        with self._locks[user_id]:
+            return fn(self._user_views(user_id)[1], *args, **kwargs)
+
+    def reset(self, user_id: str):
+        with self._locks[user_id]:
+            self._transactions.pop(user_id, None)
+            self._views_cache.pop(user_id)
+            self._bump(user_id)
+            self._seeded = True          # skip re-seeding
+
+    def size(self) -> int:
+        return sum(len(txns) for txns in list(self._transactions.values()))
+
+    def version(self, user_id: str) -> int:
+        return self._versions.get(user_id, 0)
+
+
+# ───────────────────────────────────────────────────
+# SQLite backend — durable, shared between workers
+# ───────────────────────────────────────────────────
+_BUMP_VERSION = (
+    "INSERT INTO versions (user_id, version) VALUES (?, 1) "
+    "ON CONFLICT (user_id) DO UPDATE SET version = version + 1"
+)
+
+# A reset also starts a new generation of the user's cached views
+_BUMP_GENERATION = (
+    "INSERT INTO versions (user_id, version, generation) VALUES (?, 1, 1) "
+    "ON CONFLICT (user_id) DO UPDATE SET version = version + 1, generation = generation + 1"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+    id            TEXT NOT NULL,
+    user_id       TEXT NOT NULL,
+    recipient_upi TEXT NOT NULL,
+    amount        REAL NOT NULL,
+    epoch         REAL NOT NULL,
+    status        TEXT,
+    level         TEXT,
+    body          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_txn_user_seq       ON transactions (user_id, seq);
+CREATE INDEX IF NOT EXISTS idx_txn_user_recipient ON transactions (user_id, recipient_upi);
+CREATE INDEX IF NOT EXISTS idx_txn_user_epoch     ON transactions (user_id, epoch);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    body    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    user_id TEXT PRIMARY KEY,
+    balance REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    user_id    TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('token', lower(hex(randomblob(4))));
+"""
+
+
+class SQLiteStore(TransactionStore):
+    """
+    Transactions live in one SQLite file in WAL mode, so several worker
+    processes can read concurrently while one writes.
+
+    Calls block on disk and locks, so async handlers get them via a thread.
+
+    Balance debits are a compare-and-swap (UPDATE ... WHERE balance >= ?)
+    inside the same write transaction as the insert, so concurrent sends
+    from any number of workers can never overdraw an account.
+
+    Profiles and dashboard counters are cached per process (an LRU of
+    VIEW_CACHE_USERS users) and caught up incrementally by folding in
+    only the rows with seq > the last one seen. A reset bumps the user's generation (beside their version),
+    which makes every process rebuild that user's views only.
+
+    Per-user versions live in the database too, bumped inside the same
+    write transaction as the change, so every worker agrees on them.
+    """
+
+    blocking_io = True
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        # user_id → (profile, dashboard, last_seq, generation)
+        self._views_cache = ViewCache()
+        self._views_locks = KeyedLocks()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+            try:
+                # Databases created before per-user generations
+                conn.execute("ALTER TABLE versions ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass                     # column already there
+        self.token = self._conn().execute("SELECT value FROM meta WHERE key = 'token'").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and per process (never reuse across fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def claim_seed(self) -> bool:
+        cur = self._conn().execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')")
+        return cur.rowcount == 1
+
+    def commit(self, user_id, txn, debit=0.0):
+        _stamp(txn)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if debit:
+                cur = conn.execute(
+                    "UPDATE balances SET balance = ROUND(balance - ?, 2) "
+                    "WHERE user_id = ? AND balance >= ?",
+                    (debit, user_id, debit),
+                )
+                if cur.rowcount == 0:
+                    conn.execute("ROLLBACK")
+                    return None
+            conn.execute(
+                "INSERT INTO transactions (id, user_id, recipient_upi, amount, epoch, status, level, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (txn["id"], user_id, txn["recipientUPI"], txn["amount"], txn["epoch"],
+                 txn.get("status"), (txn.get("riskResult") or {}).get("level"), json.dumps(txn)),
+            )
+            conn.execute(_BUMP_VERSION, (user_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return txn
+
+    def user(self, user_id: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT body FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_user(self, user: dict):
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO users (user_id, body) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET body = excluded.body",
+                (user["id"], json.dumps(user)),
+            )
+            conn.execute(_BUMP_VERSION, (user["id"],))
+
+    def balance(self, user_id: str) -> float:
+        row = self._conn().execute(
+            "SELECT balance FROM balances WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def set_balance(self, user_id: str, amount: float):
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO balances (user_id, balance) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET balance = excluded.balance",
+                (user_id, amount),
+            )
+            conn.execute(_BUMP_VERSION, (user_id,))
+
+    def history(self, user_id: str) -> List[dict]:
+        rows = self._conn().execute(
+            "SELECT body FROM transactions WHERE user_id = ? ORDER BY seq DESC", (user_id,)
+        )
+        return [json.loads(body) for (body,) in rows]
+
+    def query(self, user_id, before=None, limit=100, status=None, level=None,
+              recipient=None, since=None, until=None):
+        clauses, params = ["user_id = ?"], [user_id]
+        for column, op, value in (
+            ("seq", "<", before), ("status", "=", status), ("level", "=", level),
+            ("recipient_upi", "=", recipient), ("epoch", ">=", since), ("epoch", "<=", until),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        rows = self._conn().execute(
+            f"SELECT seq, body FROM transactions WHERE {' AND '.join(clauses)} "
+            "ORDER BY seq DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [json.loads(body) for _, body in rows[:limit]], next_cursor
+
+    def _views(self, user_id: str) -> tuple:
+        """Catch the cached (profile, dashboard) pair up with the database (caller holds the user's views lock)."""
+        conn = self._conn()
+        # One read snapshot: a reset can't land between the generation and the rows
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(
+                "SELECT generation FROM versions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            generation = row[0] if row else 0
+            cached = self._views_cache.get(user_id)
+            if cached is None or cached[3] != generation:
+                cached = (UserProfile(), DashboardAggregates(), 0, generation)
+
+            profile, dashboard, last_seq, _ = cached
+            rows = conn.execute(
+                "SELECT seq, body FROM transactions WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, last_seq),
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        for seq, body in rows:
+            txn = json.loads(body)
+            profile.add(txn)
+            dashboard.add(txn)
+            last_seq = seq
+
+        self._views_cache.put(user_id, (profile, dashboard, last_seq, generation))
+        return profile, dashboard
+
+    # Catch-up folds rows in from any thread, so reads stay inside the lock
+    def read_profile(self, user_id, fn, *args, **kwargs):
+        with self._views_locks[user_id]:
+            return fn(self._views(user_id)[0], *args, **kwargs)
+
+    def read_dashboard(self, user_id, fn, *args, **kwargs):
+        with self._views_locks[user_id]:
+            return fn(self._views(user_id)[1], *args, **kwargs)
+
+    def reset(self, user_id: str):
+        with self._write() as conn:
+            conn.execute("DELETE FROM transactions WHERE user_id = ?", (user_id,))
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')")
+            conn.execute(_BUMP_GENERATION, (user_id,))
+
+    @contextmanager
+    def _write(self):
+        """BEGIN IMMEDIATE … COMMIT around the block, rolling back on error."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def version(self, user_id: str) -> int:
+        row = self._conn().execute(
+            "SELECT version FROM versions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+
+# ───────────────────────────────────────────────────
+# Process-wide store accessor
+# ───────────────────────────────────────────────────
+_store: TransactionStore | None = None
+_store_lock = threading.Lock()
+
+
+def create_store(spec: str) -> TransactionStore:
+    """Build a store from a spec string: 'memory' or 'sqlite:<path>'."""
+    if spec == "memory":
+        return InMemoryStore()
+    if spec.startswith("sqlite:"):
+        return SQLiteStore(spec[len("sqlite:"):] or "secureflow.db")
+    raise ValueError(f"Unknown SECUREFLOW_STORE: {spec!r}")
+
+
+def get_store() -> TransactionStore:
+    """Return the configured store, seeding demo history on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = create_store(os.environ.get("SECUREFLOW_STORE", "memory"))
+                seed_store(store)
+                _store = store
+    return _store
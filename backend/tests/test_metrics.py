@@ -0,0 +1,39 @@
+"""Request latency covers whole responses, but only the opening of event streams."""
+import asyncio
+
+import pytest
+
+from app import MetricsMiddleware
+from core import metrics
+
+SCOPE = {"type": "http", "method": "GET", "path": "/"}
+
+
+def slow_app(content_type: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type)]})
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.body", "body": b"data: x\n\n"})
+    return app
+
+
+def observed(monkeypatch, content_type: bytes) -> float:
+    seen = []
+    monkeypatch.setattr(metrics.REQUEST_SECONDS, "observe", lambda value, *labels: seen.append(value))
+
+    async def send(message):
+        pass
+
+    asyncio.run(MetricsMiddleware(slow_app(content_type))(SCOPE, None, send))
+    assert len(seen) == 1
+    return seen[0]
+
+
+def test_ordinary_responses_are_timed_to_the_last_byte(monkeypatch):
+    assert observed(monkeypatch, b"application/json") >= 0.2
+
+
+@pytest.mark.parametrize("content_type", [b"text/event-stream", b"text/event-stream; charset=utf-8"])
+def test_event_streams_are_timed_to_the_response_start(monkeypatch, content_type):
+    assert observed(monkeypatch, content_type) < 0.1
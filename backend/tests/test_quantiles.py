@@ -0,0 +1,30 @@
+"""Exact quantiles match numpy; the sketch stays within its error bound."""
+import random
+
+import numpy as np
+import pytest
+
+from core.quantiles import StreamingQuantiles
+
+
+@pytest.mark.parametrize("q", [0.0, 0.25, 0.5, 0.9, 0.99, 1.0])
+def test_exact_quantiles_match_numpy(q):
+    rng = random.Random(1)
+    values, stream = [], StreamingQuantiles()
+    for _ in range(600):
+        value = float(rng.choice([rng.randint(1, 100_000), 100, 500]))
+        values.append(value)
+        stream.add(value)
+        assert stream.quantile(q) == pytest.approx(np.quantile(values, q))
+
+
+def test_sketch_takes_over_past_the_limit():
+    rng = random.Random(2)
+    values = [float(rng.randint(1, 100_000)) for _ in range(20_000)]
+    stream = StreamingQuantiles(exact_limit=1_000)
+    for value in values:
+        stream.add(value)
+    assert not stream.exact
+    for q in (0.5, 0.9, 0.99):
+        rank = np.searchsorted(np.sort(values), stream.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.02
@@ -0,0 +1,89 @@
+"""BAD_REPUTATION must take several payers to switch on, and must not feed itself."""
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from core.reputation import ReputationCache, reputation
+
+SHOP = "shop@hdfc"
+
+
+@pytest.fixture
+def client():
+    reputation.clear()
+    with TestClient(app) as client:
+        yield client
+    reputation.clear()
+
+
+def new_user(client, name: str) -> str:
+    user_id = f"{name}-{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/users", json={
+        "id": user_id, "name": name.title(), "upiId": f"{user_id}@upi", "balance": 1_000_000,
+    })
+    assert response.status_code == 201
+    return user_id
+
+
+def send(client, user_id: str, upi: str, amount: float, remarks: str = "") -> dict:
+    response = client.post(
+        "/api/send", headers={"X-User-Id": user_id},
+        json={"recipientUPI": upi, "amount": amount, "remarks": remarks},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def blocked_payment(client, user_id: str) -> dict:
+    """One ordinary payment for a baseline, then a large "urgent" one to SHOP."""
+    send(client, user_id, f"tea-{user_id}@upi", 100)
+    txn = send(client, user_id, SHOP, 50_000, "urgent")
+    assert txn["status"] == "blocked"
+    return txn
+
+
+def fired(txn: dict) -> list:
+    return [reason["ruleId"] for reason in txn["riskResult"]["reasons"]]
+
+
+def test_one_payer_cannot_poison_a_recipient(client):
+    mallory, alice = new_user(client, "mallory"), new_user(client, "alice")
+    blocked_payment(client, mallory)
+    # Far above mallory's baseline again, so blocked without any new-recipient points
+    assert send(client, mallory, SHOP, 110_000, "urgent")["status"] == "blocked"
+
+    # Two free blocks from one user are not evidence against the shop
+    assert "BAD_REPUTATION" not in fired(send(client, alice, SHOP, 900))
+
+
+def test_independent_blocks_flag_without_feeding_back(client):
+    for name in ("bob", "carol"):
+        blocked_payment(client, new_user(client, name))
+
+    txn = blocked_payment(client, new_user(client, "dave"))
+    assert "BAD_REPUTATION" in fired(txn)
+
+    # dave's block leaned on BAD_REPUTATION, so it was not counted
+    rep = reputation.get(SHOP)
+    assert (rep.blockers, rep.blocked) == (2, 2)
+
+
+def test_only_new_evidence_restarts_the_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    cache = ReputationCache(ttl=100)
+
+    cache.record(SHOP, "mallory", blocked=True)
+    clock[0] = 1090
+    cache.record(SHOP, "mallory", blocked=True)     # same payer, same verdict
+    clock[0] = 1101
+    assert cache.get(SHOP) is None
+
+    cache.record(SHOP, "mallory", blocked=False)
+    clock[0] = 1190
+    cache.record(SHOP, "alice", blocked=False)      # a new payer
+    clock[0] = 1250
+    assert cache.get(SHOP).payers == 2
@@ -0,0 +1,88 @@
+"""Decision guarantees of the risk engine, checked on random histories."""
+from datetime import datetime, timezone
+import random
+import time
+
+import pytest
+
+from core.friction_engine import friction_tier
+from core.profile import UserProfile
+from core.reputation import reputation
+from core.risk_engine import analyze_batch, analyze_transaction
+from models import AnalyzeRequest
+from tests import baseline_engine
+
+UPIS = ["rahul@okaxis", "priya@upi", "x@y", "claim.prize@upi", "helpdesk1@ybl", "9876543210123@paytm"]
+REMARKS = ["", "tea", "rent for march", "urgent send money now", "lottery winner free gift otp kyc", "help me hospital"]
+HISTORY_AMOUNTS = [50, 100, 500, 1000, 2000, 10000]
+# Includes exact 3× / 4× multiples of typical baselines, to pin the comparisons
+AMOUNTS = HISTORY_AMOUNTS + [300, 999, 1500, 4000, 15000, 20000, 30000, 60000]
+TRUSTED = ["priya@upi", "rahul@okaxis"]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_reputation():
+    reputation.clear()
+    yield
+    reputation.clear()
+
+
+def random_cases(seed: int, n: int = 150):
+    """(history, profile, trusted contacts, payloads) for `n` random users."""
+    rng = random.Random(seed)
+    now = time.time()
+    for _ in range(n):
+        history, profile = [], UserProfile()
+        for _ in range(rng.randint(0, 20)):
+            # Some inside the HIGH_FREQUENCY window, most well before it
+            epoch = now - rng.choice([rng.randint(0, 500), rng.randint(700, 90 * 86400)])
+            txn = {
+                "recipientUPI": rng.choice(UPIS),
+                "amount": rng.choice(HISTORY_AMOUNTS),
+                "epoch": epoch,
+                "timestamp": datetime.fromtimestamp(epoch, timezone.utc).isoformat(),
+            }
+            history.append(txn)
+            profile.add(txn)
+        trusted = rng.choice([None, TRUSTED])
+        payloads = [
+            AnalyzeRequest(recipientUPI=rng.choice(UPIS), amount=rng.choice(AMOUNTS), remarks=rng.choice(REMARKS))
+            for _ in range(5)
+        ]
+        yield history, profile, trusted, payloads
+
+
+def dumped(reasons) -> list:
+    return [reason.model_dump() for reason in reasons]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fast_mode_settles_on_the_explain_tier(seed):
+    for _, profile, trusted, payloads in random_cases(seed):
+        for payload in payloads:
+            full, _ = analyze_transaction(payload, profile, trusted)
+            fast, _ = analyze_transaction(payload, profile, trusted, fast=True)
+            assert friction_tier(fast) == friction_tier(full), payload
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_matches_scoring_each_payload(seed):
+    for _, profile, trusted, payloads in random_cases(seed):
+        batch = analyze_batch(payloads, profile, trusted)
+        single = [analyze_transaction(payload, profile, trusted) for payload in payloads]
+        assert [(score, dumped(reasons)) for score, reasons in batch] == \
+               [(score, dumped(reasons)) for score, reasons in single]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_engine_matches_the_baseline_engine(seed):
+    for history, profile, trusted, payloads in random_cases(seed):
+        for payload in payloads:
+            expected_score, expected = baseline_engine.analyze_transaction(payload, history, trusted)
+            score, reasons = analyze_transaction(payload, profile, trusted)
+            expected, reasons = dumped(expected), dumped(reasons)
+            # SUSPICIOUS_UPI now names the patterns that matched; all else is unchanged
+            for reason in expected + reasons:
+                if reason["ruleId"] == "SUSPICIOUS_UPI":
+                    reason["description"] = None
+            assert (score, reasons) == (expected_score, expected), payload
@@ -0,0 +1,46 @@
+"""A bad rule config is rejected as a whole; the previous rules stay active."""
+import json
+import os
+
+import pytest
+
+from core import risk_engine
+from core.rules import RuleRegistry
+
+BAD_CONFIGS = [
+    {"rules": {"SCAM_KEYWROD": {"weight": 40}}},            # misspelt rule id
+    {"rules": {"NIGHT_OWL": {"enabeld": True}}},            # misspelt field
+    {"rules": {"NIGHT_OWL": {"enabled": "true"}}},
+    {"rules": {"SCAM_KEYWORD": {"weight": "30"}}},
+    {"rules": {"SCAM_KEYWORD": {"severity": "CRITICAL"}}},
+    {"scamKeywords": "urgent"},                              # would be one keyword per letter
+    {"suspiciousUpiPatterns": ["(scam|fraud)"]},
+    {"scamKeyword": ["urgent"]},
+    ["not", "an", "object"],
+]
+
+
+def write(path, config, mtime: float):
+    path.write_text(json.dumps(config))
+    os.utime(path, (mtime, mtime))
+
+
+def test_string_keywords_raise_before_anything_changes():
+    before = list(risk_engine.SCAM_KEYWORDS)
+    with pytest.raises(ValueError, match="scamKeywords"):
+        risk_engine._apply_config({"scamKeywords": "urgent"})
+    assert risk_engine.SCAM_KEYWORDS == before
+
+
+@pytest.mark.parametrize("bad", BAD_CONFIGS)
+def test_bad_config_keeps_previous_rules(tmp_path, bad):
+    path = tmp_path / "rules.json"
+    write(path, {"rules": {"NIGHT_OWL": {"enabled": False}}}, 1_000)
+    registry = RuleRegistry(risk_engine.FEATURES, risk_engine.RULES, config_path=str(path),
+                            on_config=risk_engine._apply_config)
+    good = registry.active
+    assert "NIGHT_OWL" not in good.order
+
+    write(path, bad, 2_000)
+    registry.maybe_reload(force=True)
+    assert registry.active is good
@@ -0,0 +1,35 @@
+"""Per-user views stay bounded and come back identical after eviction."""
+import time
+
+import pytest
+
+from core.stats_engine import DashboardAggregates
+from store import InMemoryStore, SQLiteStore, ViewCache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    return InMemoryStore() if request.param == "memory" else SQLiteStore(str(tmp_path / "views.db"))
+
+
+def txn(upi: str, amount: float) -> dict:
+    return {
+        "recipientUPI": upi, "amount": amount, "status": "completed",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "riskResult": {"score": 10, "level": "LOW", "reasons": []},
+    }
+
+
+def test_views_are_evicted_and_rebuilt(store):
+    store._views_cache = ViewCache(max_users=2)
+    for i, user_id in enumerate(["a", "b", "c"]):
+        for amount in (100, 200, 300 + i):
+            store.add(user_id, txn(f"{user_id}@upi", amount))
+        store.read_profile(user_id, lambda p: p.count)
+    assert len(store._views_cache) == 2
+
+    # "a" was evicted: its views are rebuilt, with commits made meanwhile
+    store.add("a", txn("new@upi", 900))
+    assert store.read_profile("a", lambda p: (p.count, p.median, p.has_paid("new@upi"))) == (4, 250, True)
+    assert store.read_dashboard("a", DashboardAggregates.stats)["totalTransactions"] == 4
+    assert len(store._views_cache) == 2
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { getDashboardStats, type DashboardStats } from '../services/api';
+import { getDashboardStats, subscribeLive, type DashboardStats } from '../services/api';
 
 /* ═══════════════════════════════════════════════════
    PALETTE — refined, easy on eyes
@@ -216,10 +216,17 @@ export default function Dashboard() {
   };
 
   useEffect(() => {
-    fetchData();
-    // Auto-refresh every 15 seconds for live feel
-    const interval = setInterval(fetchData, 15000);
-    return () => clearInterval(interval);
+    // The first load comes from the stream's 'ready' (or, if the stream
+    // cannot open, onUnavailable). Stats are pushed after every send; the
+    // slow refresh only keeps the relative times ("2m ago") current and is
+    // usually a cached response
+    const unsubscribe = subscribeLive({
+      onStats: d => { setStats(d); setLastRefresh(new Date()); },
+      onResync: fetchData,
+      onUnavailable: fetchData,
+    });
+    const interval = setInterval(fetchData, 60000);
+    return () => { unsubscribe(); clearInterval(interval); };
   }, []);
 
   // Loading state
@@ -581,11 +588,13 @@ export default function Dashboard() {
                   BEHAVIORAL_SHIFT: 'Behavioral Shift',
                   NIGHT_OWL: 'Night Owl',
                   SUSPICIOUS_UPI: 'Suspicious UPI',
+                  BAD_REPUTATION: 'Bad Reputation',
+                  BLOCKLISTED_UPI: 'Blocklisted UPI',
                   TRUSTED_CONTACT: 'Trusted Contact',
                 };
                 const maxCount = stats.topRules?.[0]?.count ?? 1;
                 const barPct = Math.max(8, (rule.count / maxCount) * 100);
-                const ruleCol = rule.ruleId === 'SCAM_KEYWORD' || rule.ruleId === 'BEHAVIORAL_SHIFT' || rule.ruleId === 'SUSPICIOUS_UPI'
+                const ruleCol = rule.ruleId === 'SCAM_KEYWORD' || rule.ruleId === 'BEHAVIORAL_SHIFT' || rule.ruleId === 'SUSPICIOUS_UPI' || rule.ruleId === 'BAD_REPUTATION' || rule.ruleId === 'BLOCKLISTED_UPI'
                   ? P.danger
                   : rule.ruleId === 'TRUSTED_CONTACT' ? P.accent : '#E2A336';
                 return (
@@ -622,7 +631,7 @@ export default function Dashboard() {
                   <span className="text-[10px] font-bold" style={{ color: P.accent }}>ENGINE ACTIVE</span>
                 </div>
                 <span className="text-[10px] font-mono" style={{ color: P.textD }}>
-                  {stats.rulesEvaluated ?? 9} rules · 4 tiers
+                  {stats.rulesEvaluated ?? 11} rules · 4 tiers
                 </span>
               </div>
             </div>
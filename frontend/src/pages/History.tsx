@@ -1,10 +1,20 @@
-import React, { useEffect, useState } from 'react';
-import { getHistory } from '../services/api';
+import React, { useEffect, useRef, useState } from 'react';
+import {
+  downloadHistoryExport,
+  getDashboardStats,
+  getHistoryPage,
+  subscribeLive,
+  type DashboardStats,
+  type HistoryQuery,
+} from '../services/api';
 import type { Transaction } from '../types';
 import RiskBadge from '../components/RiskBadge';
 
 type FilterTab = 'all' | 'safe' | 'flagged' | 'blocked';
 
+// Rows fetched per page; older pages load on demand
+const PAGE_SIZE = 50;
+
 const formatAmount = (amount: number) =>
   '₹' + amount.toLocaleString('en-IN');
 
@@ -82,6 +92,15 @@ const TABS: { key: FilterTab; label: string }[] = [
   { key: 'blocked', label: 'Blocked' },
 ];
 
+// Each tab is a server-side filter. Blocked payments are always HIGH risk,
+// so the Blocked tab (blocked or HIGH) is the HIGH level.
+const TAB_QUERY: Record<FilterTab, HistoryQuery> = {
+  all:     {},
+  safe:    { level: 'LOW' },
+  flagged: { level: 'MEDIUM' },
+  blocked: { level: 'HIGH' },
+};
+
 const History: React.FC = () => {
   const [transactions, setTransactions] = useState<Transaction[]>([]);
   const [loading, setLoading] = useState(true);
@@ -89,26 +108,87 @@ const History: React.FC = () => {
   const [tab, setTab] = useState<FilterTab>('all');
   const [expanded, setExpanded] = useState<Set<string>>(new Set());
   const [search, setSearch] = useState('');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [loadMoreFailed, setLoadMoreFailed] = useState(false);
+  const [exporting, setExporting] = useState<'idle' | 'busy' | 'failed'>('idle');
+  const [stats, setStats] = useState<DashboardStats | null>(null);
+  // Read by the stream handlers, which are registered once
+  const tabRef = useRef(tab);
+  // Bumped per first-page load: responses for an older tab are dropped
+  const requestRef = useRef(0);
+
+  const loadFirstPage = () => {
+    const request = ++requestRef.current;
+    getHistoryPage({ ...TAB_QUERY[tabRef.current], limit: PAGE_SIZE })
+      .then((page) => {
+        if (request !== requestRef.current) return;
+        setTransactions(page.items);
+        setNextCursor(page.nextCursor);
+        setLoadMoreFailed(false);
+        setError(null);
+      })
+      .catch(() => {
+        if (request === requestRef.current) {
+          setError('Failed to load transaction history. Is the backend running?');
+        }
+      })
+      .finally(() => {
+        if (request === requestRef.current) setLoading(false);
+      });
+    // Tab counts cover the whole history, not just the loaded pages
+    getDashboardStats().then(setStats).catch(() => {});
+  };
+
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    const request = requestRef.current;
+    setLoadingMore(true);
+    getHistoryPage({ ...TAB_QUERY[tab], limit: PAGE_SIZE, cursor: nextCursor })
+      .then((page) => {
+        if (request !== requestRef.current) return;
+        setTransactions((prev) => [...prev, ...page.items]);
+        setNextCursor(page.nextCursor);
+        setLoadMoreFailed(false);
+      })
+      .catch(() => setLoadMoreFailed(true))
+      .finally(() => setLoadingMore(false));
+  };
+
+  const exportHistory = () => {
+    setExporting('busy');
+    downloadHistoryExport(TAB_QUERY[tab])
+      .then(() => setExporting('idle'))
+      .catch(() => setExporting('failed'));
+  };
 
   useEffect(() => {
-    const fetchData = () => {
-      getHistory()
-        .then(setTransactions)
-        .catch(() => setError('Failed to load transaction history. Is the backend running?'))
-        .finally(() => setLoading(false));
-    };
-    fetchData();
-    const interval = setInterval(fetchData, 10000);
-    return () => clearInterval(interval);
+    // Live updates: new transactions are pushed by the backend instead of
+    // polled. The stream's 'ready' (sent on every (re)connect) also loads
+    // the first page, so there is no separate initial fetch.
+    return subscribeLive({
+      onTransaction: (txn) => {
+        const { level } = TAB_QUERY[tabRef.current];
+        if (level && txn.riskResult.level !== level) return;
+        setTransactions((prev) => [txn, ...prev.filter((t) => t.id !== txn.id)]);
+      },
+      onStats: setStats,
+      onResync: loadFirstPage,
+      onUnavailable: loadFirstPage,
+    });
   }, []);
 
-  const filtered = transactions.filter((t) => {
-    // Tab filter
-    if (tab === 'safe'    && t.riskResult.level !== 'LOW') return false;
-    if (tab === 'flagged' && t.riskResult.level !== 'MEDIUM') return false;
-    if (tab === 'blocked' && t.status !== 'blocked' && t.riskResult.level !== 'HIGH') return false;
+  useEffect(() => {
+    // Switching tabs refetches from the newest page with the tab's filter
+    if (tabRef.current === tab) return;
+    tabRef.current = tab;
+    setLoading(true);
+    setExpanded(new Set());
+    loadFirstPage();
+  }, [tab]);
 
-    // Search filter
+  // Search narrows the loaded pages
+  const filtered = transactions.filter((t) => {
     if (search.trim()) {
       const q = search.toLowerCase();
       const matchesName = t.recipientName.toLowerCase().includes(q);
@@ -130,11 +210,11 @@ const History: React.FC = () => {
     });
   };
 
-  const counts = {
-    all:     transactions.length,
-    safe:    transactions.filter(t => t.riskResult.level === 'LOW').length,
-    flagged: transactions.filter(t => t.riskResult.level === 'MEDIUM').length,
-    blocked: transactions.filter(t => t.status === 'blocked' || t.riskResult.level === 'HIGH').length,
+  const counts: Record<FilterTab, number | undefined> = {
+    all:     stats?.totalTransactions,
+    safe:    stats?.riskDistribution.low.count,
+    flagged: stats?.riskDistribution.medium.count,
+    blocked: stats?.riskDistribution.high.count,
   };
 
   return (
@@ -159,7 +239,7 @@ const History: React.FC = () => {
               Transaction History
             </h1>
             <p className="mt-0.5 text-xs font-medium" style={{ color: 'rgba(0,255,135,0.4)' }}>
-              {transactions.length} total transactions · SecureFlow audit trail
+              {counts.all ?? transactions.length} total transactions · SecureFlow audit trail
             </p>
           </div>
 
@@ -189,7 +269,7 @@ const History: React.FC = () => {
                         color: active ? '#00FF87' : 'rgba(0,255,135,0.3)',
                       }}
                     >
-                      {counts[key]}
+                      {counts[key] ?? '–'}
                     </span>
                   </button>
                 );
@@ -227,6 +307,20 @@ const History: React.FC = () => {
                 </button>
               )}
             </div>
+
+            {/* NDJSON export of everything in the current tab */}
+            <button
+              onClick={exportHistory}
+              disabled={exporting === 'busy'}
+              className="px-4 py-2 rounded-lg text-xs font-bold transition-all duration-150"
+              style={{
+                background: 'transparent',
+                color: exporting === 'failed' ? '#FCA5A5' : 'rgba(0,255,135,0.5)',
+                border: '1px solid rgba(0,255,135,0.1)',
+              }}
+            >
+              {exporting === 'busy' ? 'Exporting…' : exporting === 'failed' ? 'Export failed — retry' : 'Export'}
+            </button>
           </div>
         </div>
       </div>
@@ -513,10 +607,28 @@ const History: React.FC = () => {
               className="text-center text-xs mt-6 font-medium"
               style={{ color: 'rgba(0,255,135,0.2)' }}
             >
-              Showing {filtered.length} of {transactions.length} transactions
+              Showing {filtered.length} of {counts[tab] ?? transactions.length} transactions
             </p>
           </div>
         )}
+
+        {/* Older pages */}
+        {!loading && !error && nextCursor && (
+          <div className="flex justify-center mt-4">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-5 py-2 rounded-lg text-xs font-bold transition-all duration-150"
+              style={{
+                background: 'rgba(0,255,135,0.06)',
+                color: loadMoreFailed ? '#FCA5A5' : '#00FF87',
+                border: '1px solid rgba(0,255,135,0.2)',
+              }}
+            >
+              {loadingMore ? 'Loading…' : loadMoreFailed ? 'Failed — retry' : 'Load older transactions'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
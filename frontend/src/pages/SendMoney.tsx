@@ -201,6 +201,7 @@ const SendMoney: React.FC = () => {
             recipientUPI: upi.trim(),
             amount: amt,
             remarks: remarks.trim(),
+            decisionToken: result.decisionToken,
           });
         } catch { /* best-effort persist */ }
         setStep('blocked');
@@ -216,10 +217,12 @@ const SendMoney: React.FC = () => {
   const handleConfirm = async () => {
     setStep('sending');
     try {
+      // Reuses the analysis shown on screen unless the history changed since
       await sendTransaction({
         recipientUPI: upi.trim(),
         amount: parseFloat(amount),
         remarks: remarks.trim(),
+        decisionToken: risk?.decisionToken,
       });
       setStep('success');
     } catch {
@@ -489,7 +492,7 @@ const SendMoney: React.FC = () => {
                   {/* Analysis speed badge */}
                   {risk.analysisTimeMs != null && (
                     <p className="text-[10px] font-mono mt-1" style={{ color: P.textM }}>
-                      {risk.rulesEvaluated ?? 9} rules evaluated in {risk.analysisTimeMs}ms
+                      {risk.rulesEvaluated ?? 11} rules evaluated in {risk.analysisTimeMs}ms
                     </p>
                   )}
                   <div className="mt-2 inline-flex items-center gap-1.5 px-2.5 py-1 rounded-full text-[10px] font-black"
@@ -5,14 +5,66 @@ import type { Transaction, User } from '../types';
 // In production, set VITE_API_BASE_URL to your deployed backend URL.
 const BASE_URL = import.meta.env.VITE_API_BASE_URL ?? '';
 
+// Optional: act as a specific backend user (defaults to the demo user).
+const USER_ID = import.meta.env.VITE_USER_ID;
+
 const api = axios.create({
   baseURL: BASE_URL,
-  headers: { 'Content-Type': 'application/json' },
+  headers: {
+    'Content-Type': 'application/json',
+    ...(USER_ID ? { 'X-User-Id': USER_ID } : {}),
+  },
 });
 
-export const getHistory = async (): Promise<Transaction[]> => {
-  const res = await api.get<Transaction[]>('/api/history');
-  return res.data;
+export interface HistoryQuery {
+  limit?: number;
+  cursor?: string;
+  status?: Transaction['status'];
+  level?: 'LOW' | 'MEDIUM' | 'HIGH';
+  recipient?: string;
+  since?: string;
+  until?: string;
+}
+
+export interface HistoryPage {
+  items: Transaction[];
+  nextCursor: string | null;
+}
+
+// Query parameters from the defined, non-empty fields only (an unset
+// filter must not reach the backend as "undefined")
+const toParams = (query: object): Record<string, string> =>
+  Object.fromEntries(
+    Object.entries(query)
+      .filter(([, value]) => value !== undefined && value !== null && value !== '')
+      .map(([key, value]) => [key, String(value)]),
+  );
+
+// Newest page of history (the backend pages at 100 rows by default)
+export const getHistory = async (query: HistoryQuery = {}): Promise<Transaction[]> => {
+  const page = await getHistoryPage(query);
+  return page.items;
+};
+
+// One page; pass nextCursor back as `cursor` for the next (older) one
+export const getHistoryPage = async (query: HistoryQuery = {}): Promise<HistoryPage> => {
+  const res = await api.get<Transaction[]>('/api/history', { params: toParams(query) });
+  return { items: res.data, nextCursor: res.headers['x-next-cursor'] ?? null };
+};
+
+// NDJSON export of every matching transaction (streamed by the backend).
+// Fetched through the API client so it carries X-User-Id, then saved.
+export const downloadHistoryExport = async (query: Omit<HistoryQuery, 'limit' | 'cursor'> = {}) => {
+  const res = await api.get<Blob>('/api/history/export', {
+    params: toParams(query),
+    responseType: 'blob',
+  });
+  const url = URL.createObjectURL(res.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = 'secureflow-history.ndjson';
+  link.click();
+  setTimeout(() => URL.revokeObjectURL(url), 0);
 };
 
 export const getUser = async (): Promise<User> => {
@@ -33,6 +85,7 @@ export const sendTransaction = async (payload: {
   recipientUPI: string;
   amount: number;
   remarks: string;
+  decisionToken?: string;
 }) => {
   const res = await api.post('/api/send', payload);
   return res.data;
@@ -73,4 +126,42 @@ export const getDashboardStats = async (): Promise<DashboardStats> => {
   return res.data;
 };
 
+// ───────────────────────────────────────────────────
+// Server-sent events: the backend pushes each committed transaction and
+// the refreshed dashboard stats. 'resync' fires when the client should
+// refetch instead (connection (re)opened, history reset, or a change
+// made by another backend worker).
+// ───────────────────────────────────────────────────
+export interface LiveHandlers {
+  onTransaction?: (txn: Transaction) => void;
+  onStats?: (stats: DashboardStats) => void;
+  onResync?: () => void;
+  // The stream failed before its first 'ready' (fires once): pages that
+  // load on 'ready' should fetch directly instead
+  onUnavailable?: () => void;
+}
+
+export const subscribeLive = (handlers: LiveHandlers): (() => void) => {
+  const query = USER_ID ? `?user=${encodeURIComponent(USER_ID)}` : '';
+  const source = new EventSource(`${BASE_URL}/api/events${query}`);
+  const parse = <T>(listener?: (data: T) => void) => (e: MessageEvent) =>
+    listener?.(JSON.parse(e.data) as T);
+
+  source.addEventListener('transaction', parse(handlers.onTransaction));
+  source.addEventListener('stats', parse(handlers.onStats));
+  // 'ready' arrives on every (re)connect, so anything missed while disconnected is refetched
+  for (const event of ['ready', 'reset', 'sync']) {
+    source.addEventListener(event, () => handlers.onResync?.());
+  }
+  let settled = false;
+  source.addEventListener('ready', () => { settled = true; });
+  source.addEventListener('error', () => {
+    if (!settled) {
+      settled = true;
+      handlers.onUnavailable?.();
+    }
+  });
+  return () => source.close();
+};
+
 export default api;
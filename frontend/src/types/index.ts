@@ -21,6 +21,8 @@ export interface RiskResult {
   friction: FrictionConfig;
   analysisTimeMs?: number;
   rulesEvaluated?: number;
+  // Signed result from /api/analyze; pass it to /api/send to skip re-scoring
+  decisionToken?: string;
 }
 
 export interface Transaction {
@@ -39,5 +41,6 @@ export interface User {
   name: string;
   upiId: string;
   balance: number;
+  initialBalance?: number;
   trustedContacts: string[];
 }